@@ -1,7 +1,10 @@
+import itertools
 import logging
 import math
 import os
 
+from CubePostprocessor import follow
+
 log = logging.getLogger("Cubifier")
 
 SLICER_CURA = "Cura"
@@ -9,6 +12,94 @@ SLICER_KISSLICER = "KISSlicer"
 SLICER_SIMPLIFY3D = "Simplify3d"
 SLICER_SLIC3R = "Slic3r"
 
+# how a file is processed
+ENGINE_MEMORY = "memory" # whole file as a list of lines
+ENGINE_COMPACT = "compact" # as above, but without extra copies of the file when reading and writing
+ENGINE_STREAMING = "streaming" # read, processed and written piece by piece, see LineWindow
+
+SAVE_BATCH_SIZE = 10000 # lines joined at a time when saving without a full copy
+
+
+class LineWindow:
+    """
+    The part of a file a pass is working on when the file is processed while it's being read.
+    Lines are addressed by their index in the whole file, the lines a pass is done with are
+    dropped from the start and handed over to the next pass.
+    """
+
+    def __init__(self, pass_generator):
+        self.lines = []
+        self.offset = 0
+        self.generator = pass_generator
+        self.started = False
+        self.line_index = 0
+
+    def __len__(self):
+        return self.offset + len(self.lines)
+
+    def get_index(self, index):
+        if index < 0:
+            return index
+        if index < self.offset:
+            raise ValueError("Line %s is already handed over" % index)
+        return index - self.offset
+
+    def __getitem__(self, index):
+        return self.lines[self.get_index(index)]
+
+    def __setitem__(self, index, line):
+        self.lines[self.get_index(index)] = line
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start = self.offset if index.start is None else index.start
+            stop = len(self) if index.stop is None else index.stop
+            index = slice(self.get_index(start), self.get_index(stop))
+        else:
+            index = self.get_index(index)
+        del self.lines[index]
+
+    def insert(self, index, line):
+        self.lines.insert(self.get_index(index), line)
+
+    def pop(self, index):
+        return self.lines.pop(self.get_index(index))
+
+    def extend(self, lines):
+        self.lines.extend(lines)
+
+    def drop(self, index):
+        # remove and return lines before index
+        count = max(0, index - self.offset)
+        lines = self.lines[:count]
+        del self.lines[:count]
+        self.offset += count
+        return lines
+
+    def run(self, print_file, more):
+        # let the pass work on the lines added since the last run, returns the index
+        # of the first line the pass may still change
+        if self.generator is None:
+            return len(self)
+        print_file.lines = self
+        print_file.line_index = self.line_index
+        try:
+            if not self.started:
+                if more and not self.lines:
+                    return self.offset
+                self.started = True
+                stable = next(self.generator)
+            else:
+                stable = self.generator.send(True)
+            if not more:
+                # all lines are read, let the pass finish
+                stable = self.generator.send(False)
+        except StopIteration:
+            self.generator = None
+            stable = len(self)
+        self.line_index = print_file.line_index
+        return stable
+
 
 class PrintFile:
     slicer_type = None
@@ -24,17 +115,102 @@ class PrintFile:
                    b"M17",
                    b"M112",
                    b"M135"]
+    # Names of the processing passes, run in this order. A pass is a generator working on
+    # self.lines, at the end of the lines it yields the index of the first line it may still
+    # change and continues if the yield returns True (more lines were added).
+    PASSES = []
+    # Starts of lines the slicer writes at the end of a print, used to tell if a followed
+    # file is complete
+    END_MARKERS = []
 
     def __init__(self, debug=False):
+        # log level is set by the caller, the "Cubifier" logger is shared by all print files
         self.debug = debug
-        if debug:
-            log.setLevel(logging.DEBUG)
-        else:
-            log.setLevel(logging.INFO)
         self.settings = {}
         self.lines = []
         self.gcode_file = None
         self.line_index = 0
+        self.memory_monitor = None
+        self.layer_stats = None # collected by flavors that compute extrusion paths
+
+    def process(self, gcode_file, engine=ENGINE_MEMORY):
+        if engine == ENGINE_STREAMING:
+            # a complete file is streamed by following it without waiting for more
+            return self.process_lines(follow.follow_lines(gcode_file, 0), gcode_file)
+        compact = engine == ENGINE_COMPACT
+        try:
+            if self.open_file(gcode_file, compact) == 1:
+                return 1
+            self.mark_stage("open_file")
+            for name in self.PASSES:
+                self.run_pass(name)
+                self.mark_stage(name)
+            result = self.save_new_file(compact)
+            self.mark_stage("save_new_file")
+            return result
+        except BaseException:
+            # out of memory or over the limit, free the lines for the caller and leave no output behind
+            del self.lines[:]
+            self.remove_new_file()
+            raise
+
+    def process_lines(self, line_chunks, gcode_file):
+        # Process the file while it's being read. line_chunks yields lists of stripped
+        # non-empty lines, lines all passes are done with are written out right away.
+        self.gcode_file = gcode_file
+        windows = [LineWindow(getattr(self, name)()) for name in self.PASSES + ["remove_comments"]]
+
+        def advance_passes(lines, more):
+            for window in windows:
+                window.extend(lines)
+                lines = window.drop(window.run(self, more))
+            return lines
+
+        # read the first lines before the new file is created, so an unreadable file leaves nothing behind
+        line_chunks = iter(line_chunks)
+        try:
+            first_lines = next(line_chunks, [])
+        except OSError as e:
+            log.error("Cannot open file %s, error: %s" % (gcode_file, e))
+            return 1
+
+        newfile = self.get_new_file_name()
+        try:
+            with open(newfile, "wb") as nf:
+                separator = b""
+                for lines in itertools.chain([first_lines], line_chunks):
+                    lines = advance_passes(lines, True)
+                    if lines:
+                        nf.write(separator + b"\r\n".join(lines))
+                        separator = b"\r\n"
+                lines = advance_passes([], False)
+                if lines:
+                    nf.write(separator + b"\r\n".join(lines))
+                log.info("Wrote new file: %s" % newfile)
+            self.mark_stage("process_lines")
+        except OSError as e:
+            log.error("Could not process file, error: %s" % e)
+            self.remove_new_file()
+            return 1
+        except BaseException:
+            # out of memory or over the limit, free the lines for the caller and leave no output behind
+            for window in windows:
+                del window.lines[:]
+            lines = first_lines = None
+            self.remove_new_file()
+            raise
+        finally:
+            self.lines = []
+        return newfile
+
+    def run_pass(self, name):
+        # run a pass over all of self.lines
+        for stable in getattr(self, name)():
+            pass
+
+    def mark_stage(self, stage):
+        if self.memory_monitor:
+            self.memory_monitor.sample(stage)
 
     def remove_comments(self):
 
@@ -47,9 +223,11 @@ class PrintFile:
                 self.lines[self.line_index] = self.lines[self.line_index].split(b";")[0].strip()
                 self.line_index += 1
             except IndexError:
+                if (yield self.line_index):
+                    continue
                 return
 
-    def open_file(self, gcode_file):
+    def open_file(self, gcode_file, compact=False):
 
         self.gcode_file = gcode_file
         # open file
@@ -60,23 +238,43 @@ class PrintFile:
             return 1
 
         # remove extra EOL and empty lines
-        self.lines = [l.strip() for l in gf.readlines() if l.strip()]
+        if compact:
+            # strip while reading, only one copy of the lines is kept
+            self.lines = [l for l in (l.strip() for l in gf) if l]
+        else:
+            self.lines = [l.strip() for l in gf.readlines() if l.strip()]
         gf.close()
 
-    def save_new_file(self):
-        # save new file
-        self.remove_comments()
+    def get_new_file_name(self):
         _dir, fname = os.path.split(self.gcode_file)
         name, ext = os.path.splitext(fname)
-        newfile = os.path.join(_dir,  name + "_cb.bfb")
+        return os.path.join(_dir,  name + "_cb.bfb")
+
+    def remove_new_file(self):
+        newfile = self.get_new_file_name()
+        if os.path.exists(newfile):
+            os.remove(newfile)
+            log.debug("Removed partial file: %s" % newfile)
+
+    def save_new_file(self, compact=False):
+        # save new file
+        self.run_pass("remove_comments")
+        newfile = self.get_new_file_name()
         try:
             with open(newfile, "wb") as nf:
-                result = b"\r\n".join(self.lines)
-                nf.write(result)
+                if compact:
+                    for index in range(0, len(self.lines), SAVE_BATCH_SIZE):
+                        if index:
+                            nf.write(b"\r\n")
+                        nf.write(b"\r\n".join(self.lines[index:index + SAVE_BATCH_SIZE]))
+                else:
+                    result = b"\r\n".join(self.lines)
+                    nf.write(result)
                 log.info("Wrote new file: %s" % newfile)
                 return newfile
-        except Exception as e:
+        except OSError as e:
             log.error("Could not save file, error: %s" % e)
+            self.remove_new_file()
             return 1
 
     def update_extruder_speed(self, current_cmd, multiplier):
@@ -97,6 +295,15 @@ class PrintFile:
             return l, vals[1]
         return l, None
 
+    def find_line(self, prefix, start=0, end=None):
+        # index of the first line from start to end that starts with prefix, None if there's none
+        if end is None:
+            end = len(self.lines)
+        for index in range(start, end):
+            if self.lines[index].startswith(prefix):
+                return index
+        return None
+
     def calculate_path_length(self, prev_position, new_position):
 
         x_len = prev_position[0] - new_position[0]
@@ -132,4 +339,6 @@ class PrintFile:
                     continue
                 self.line_index += 1
             except IndexError:
+                if (yield self.line_index):
+                    continue
                 return
\ No newline at end of file
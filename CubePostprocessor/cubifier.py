@@ -27,25 +27,39 @@ Version 0.7
 import logging
 import os
 import platform
-import subprocess
 import sys
 import argparse
 
+from CubePostprocessor.base import ENGINE_MEMORY, ENGINE_COMPACT, ENGINE_STREAMING
+from CubePostprocessor.flavor_makerbot import MakerBotFlavor
 from CubePostprocessor.slicer_cura import CuraPrintFile
 from CubePostprocessor.slicer_kisslicer import KissPrintFile
 from CubePostprocessor.slicer_simplify3d import Simplify3dPrintFile
 from CubePostprocessor.slicer_slic3r import Slic3rPrintFile
+from CubePostprocessor import follow
+from CubePostprocessor import memory
+from CubePostprocessor import stats
 from CubePostprocessor import utils
 
-fmt = logging.Formatter(fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-filehandler = logging.FileHandler("process.log")
-filehandler.setFormatter(fmt)
-streamhandler = logging.StreamHandler(stream=sys.stdout)
-streamhandler.setFormatter(fmt)
 log = logging.getLogger("Cubifier")
-log.setLevel(logging.INFO)
-log.addHandler(filehandler)
-log.addHandler(streamhandler)
+
+ENGINE_AUTO = "auto"
+ENGINES = [ENGINE_AUTO, ENGINE_MEMORY, ENGINE_COMPACT, ENGINE_STREAMING]
+
+
+class UnsupportedFileError(Exception):
+    pass
+
+
+def setup_logging(debug=False, log_file="process.log"):
+    fmt = logging.Formatter(fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    filehandler = logging.FileHandler(log_file)
+    filehandler.setFormatter(fmt)
+    streamhandler = logging.StreamHandler(stream=sys.stdout)
+    streamhandler.setFormatter(fmt)
+    log.setLevel(logging.DEBUG if debug else logging.INFO)
+    log.addHandler(filehandler)
+    log.addHandler(streamhandler)
 
 
 def detect_file_type(gcode_file):
@@ -64,11 +78,10 @@ def detect_file_type(gcode_file):
             log.info("Detected Simplify3D format")
             return Simplify3dPrintFile
         else:
-            log.error("No supported gcode file detected. Is comments enabled on Kisslicer or '; CURA' header added to Cura start.gcode?")
-            exit(1)
+            raise UnsupportedFileError("No supported gcode file detected. Is comments enabled on Kisslicer or '; CURA' header added to Cura start.gcode?")
 
-def run_cube_utils(intermediary_file, keep_intermediary = False):
-    # Check to make sure CodeX64.exe was installed properly
+def run_cube_utils(intermediary_file, keep_intermediary = False, memory_monitor = None):
+    # returns the .cube file name or None if the encoder failed
     _dir, fname = os.path.split(intermediary_file)
     name, ext = os.path.splitext(fname)
     cube_file = os.path.join(_dir,  name + ".cube")
@@ -76,28 +89,116 @@ def run_cube_utils(intermediary_file, keep_intermediary = False):
     codex_args = ["cubepro-encoder",
         intermediary_file,
         cube_file]
-    subprocess.call(codex_args)
+    try:
+        returncode, encoder_peak = memory.run_measured(codex_args)
+    except OSError as e:
+        log.error("Could not run cubepro-encoder: {}".format(e))
+        return None
+    if returncode != 0:
+        log.error("cubepro-encoder failed with exit code {}, kept {}".format(returncode, intermediary_file))
+        return None
     log.info("Wrote new file: {}".format(cube_file))
+    if memory_monitor:
+        memory_monitor.sample("run_cube_utils", encoder_peak_rss_kb=encoder_peak)
 
     if not keep_intermediary:
         os.remove(intermediary_file)
         log.info("Removed intermediatry file: {}".format(intermediary_file))
-    return
+    return cube_file
+
+def cubify(gcode_file, keep_intermediary = False, debug = False, memory_monitor = None, stats_format = None,
+           follow_timeout = None, engine = ENGINE_AUTO, memory_budget = None):
+    # process one file into a .cube file, returns the file name or None if processing failed.
+    # With follow_timeout the file is processed while the slicer writes it, until it hasn't
+    # grown for that many seconds and the slicer has closed it. Otherwise the engine is chosen by the file size and
+    # memory_budget (MB), unless it's given.
+    if follow_timeout is not None and not follow.wait_for_first_line(gcode_file, follow_timeout):
+        log.error("Nothing written to %s in %s seconds" % (gcode_file, follow_timeout))
+        return None
+    print_type = detect_file_type(gcode_file)
+    pf = print_type(debug=debug)
+    pf.memory_monitor = memory_monitor
+    if stats_format:
+        if isinstance(pf, MakerBotFlavor):
+            pf.layer_stats = stats.LayerStats()
+        else:
+            log.warning("Layer statistics are not supported for %s files" % pf.slicer_type)
+
+    if follow_timeout is not None:
+        result_file = pf.process_lines(follow.follow_lines(gcode_file, follow_timeout, pf.END_MARKERS),
+                                       gcode_file)
+    else:
+        if engine == ENGINE_AUTO:
+            engine, reason = memory.choose_engine(os.path.getsize(gcode_file), memory_budget)
+        else:
+            reason = "selected by the user"
+        log.info("Using %s engine: %s" % (engine, reason))
+        result_file = pf.process(gcode_file, engine)
+    if result_file == 1:
+        return None
+    if pf.layer_stats:
+        name, ext = os.path.splitext(gcode_file)
+        if stats_format == "csv":
+            pf.layer_stats.write_csv(name + "_stats.csv")
+        else:
+            pf.layer_stats.write_json(name + "_stats.json")
+    return run_cube_utils(result_file, keep_intermediary, memory_monitor)
 
 def main():
-    parser = argparse.ArgumentParser(description='Postprocess bfb files for Cube 2')
+    if sys.argv[1:2] == ["serve"]:
+        from CubePostprocessor import server
+        return server.main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description='Postprocess bfb files for Cube 2',
+                                     epilog='Use "cubifier serve -h" for running as a service')
     parser.add_argument('-k', '--keep', action='store_true', help = 'keep intermediary bfb file')
     parser.add_argument('-d', '--debug', action='store_true', help = 'enable debugging mode')
+    parser.add_argument('-m', '--memory-report', action='store_true',
+                        help = 'log memory use of each stage and write it to a json summary')
+    parser.add_argument('--max-memory', type=int, metavar='MB', help = 'abort if memory use exceeds this')
+    parser.add_argument('-s', '--stats', choices=['json', 'csv'],
+                        help = 'write per layer extrusion, travel, flow and time statistics')
+    parser.add_argument('-e', '--engine', choices=ENGINES, default=ENGINE_AUTO,
+                        help = 'how to process the file, by default chosen by file size and available memory')
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                        help = 'memory the automatic engine choice may plan for, defaults to --max-memory')
+    parser.add_argument('-f', '--follow', action='store_true',
+                        help = 'process the file while the slicer is still writing it')
+    parser.add_argument('--follow-timeout', type=float, default=5, metavar='SECONDS',
+                        help = 'with --follow, the file is complete when it has not grown for this long and the slicer has closed it')
     parser.add_argument('filename')
     args = parser.parse_args()
 
     if(args.debug):
         print(args)
-
-    print_type = detect_file_type(args.filename)
-    pf = print_type(debug=args.debug)
-    result_file = pf.process(args.filename)
-    run_cube_utils(result_file, args.keep)
+    setup_logging(args.debug)
+
+    memory_monitor = None
+    if args.memory_report or args.max_memory:
+        memory_monitor = memory.MemoryMonitor(trace=args.memory_report, max_memory=args.max_memory)
+
+    # logged after the except blocks, when the traceback and the lines it holds are freed
+    abort_message = None
+    try:
+        follow_timeout = args.follow_timeout if args.follow else None
+        memory_budget = args.memory_budget or args.max_memory
+        if not cubify(args.filename, args.keep, args.debug, memory_monitor, args.stats, follow_timeout,
+                      args.engine, memory_budget):
+            exit(1)
+    except UnsupportedFileError as e:
+        log.error(e)
+        exit(1)
+    except memory.MemoryLimitExceeded as e:
+        abort_message = "Aborted, memory limit exceeded: %s" % e
+    except MemoryError:
+        abort_message = "Aborted, could not allocate memory within the limit of %s MB" % args.max_memory
+    finally:
+        if args.memory_report:
+            name, ext = os.path.splitext(args.filename)
+            memory_monitor.write_summary(name + "_memory.json")
+    if abort_message:
+        log.error(abort_message)
+        exit(1)
 
 
 if __name__ == "__main__":
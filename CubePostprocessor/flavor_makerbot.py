@@ -1,11 +1,66 @@
 import logging
 import re
-import statistics
 
 from CubePostprocessor.base import *
 
 log = logging.getLogger("Cubifier")
 
+FLOW_AVERAGE_MEAN = "mean" # plain mean of the segment feed rates, times the first speed of the run
+FLOW_AVERAGE_WEIGHTED = "weighted" # feed rate times speed of each segment, weighted by path length
+
+
+class FlowRateAccumulator:
+    """
+    Running average of the feed rates of one extrusion run, in constant memory. With
+    skip_fallback the fallback rate calculate_feed_rate returns for segments without path or
+    extrusion is left out, unless the run has nothing else.
+    """
+
+    def __init__(self, averaging=FLOW_AVERAGE_MEAN, skip_fallback=False):
+        self.averaging = averaging
+        self.skip_fallback = skip_fallback
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.first_speed = 0
+        # Neumaier compensated sum, to stay as close as possible to statistics.mean
+        self.rate_sum = 0.0
+        self.rate_error = 0.0
+        self.fallback_count = 0
+        self.fallback_sum = 0.0
+        self.flow_sum = 0.0
+        self.path_sum = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, feed_rate, speed, path_len, extrusion_len):
+        if not self.count:
+            self.first_speed = speed
+        self.count += 1
+        if self.skip_fallback and (not path_len or not extrusion_len):
+            self.fallback_count += 1
+            self.fallback_sum += feed_rate
+            return
+        total = self.rate_sum + feed_rate
+        if abs(self.rate_sum) >= abs(feed_rate):
+            self.rate_error += (self.rate_sum - total) + feed_rate
+        else:
+            self.rate_error += (feed_rate - total) + self.rate_sum
+        self.rate_sum = total
+        self.flow_sum += feed_rate * speed * path_len
+        self.path_sum += path_len
+
+    def get_flow_rate(self):
+        if self.averaging == FLOW_AVERAGE_WEIGHTED and self.path_sum:
+            return self.flow_sum / self.path_sum
+        count = self.count - self.fallback_count
+        if not count:
+            # only fallback rates in the run
+            return self.fallback_sum / self.fallback_count * self.first_speed
+        return (self.rate_sum + self.rate_error) / count * self.first_speed
+
 class MakerBotFlavor(PrintFile):
 
     EXTRUDER_RETRACT_RE = re.compile(b"^G1 E([-]*\d+\.\d+) F(\d+\.*\d*)$")
@@ -15,35 +70,34 @@ class MakerBotFlavor(PrintFile):
     MOVE_HEAD_RE = re.compile(b"^G1 X([-]*\d+\.\d+) Y([-]*\d+\.\d+) F(\d+\.*\d*)$")
     SPEED_RE = re.compile(b"^G1 F(\d+\.*\d*)$")
     EXTRUDER_POSITION_RE = re.compile(b"^G92 E0$")
+    # moves with 3 decimal coordinates, which are already in the output format
+    FIXED_POINT_MOVE_RE = re.compile(b"^G1 X(-?(?:0|[1-9]\d{0,8})\.\d{3}) Y(-?(?:0|[1-9]\d{0,8})\.\d{3})( E\d+\.\d+)?(?: F(\d+\.*\d*))?$")
 
     FLOW_MULTIPLIER = 1 # change this in inheriting classes
+    FLOW_AVERAGING = FLOW_AVERAGE_MEAN
+    SKIP_FALLBACK_FEED_RATES = False
+    PASSES = ["check_header",
+              "patch_extrusion",
+              "patch_moves",
+              "patch_fan_on_off",
+              "check_temp_change"]
 
     def __init__(self, debug=False):
         super().__init__(debug=debug)
-        self.feed_rates = []
-
-    def process(self, gcode_file):
-        self.open_file(gcode_file)
-        self.check_header()
-        self.patch_extrusion()
-        self.patch_moves()
-        self.patch_fan_on_off()
-        self.check_temp_change()
-        return self.save_new_file()
+        self.feed_rates = FlowRateAccumulator(self.FLOW_AVERAGING, self.SKIP_FALLBACK_FEED_RATES)
 
     def check_header(self):
-        # Remove lines before Cube header
+        # Remove lines before Cube header with one slice
         self.line_index = 0
         while True:
-            try:
-                l, comment = self.read_line(self.line_index)
-                if l.startswith(b"^Firmware"):
-                    break
-                else:
-                    self.delete_line(self.line_index)
-            except IndexError:
-                break
-            self.line_index += 1
+            header_index = self.find_line(b"^Firmware")
+            if header_index is not None:
+                del self.lines[:header_index]
+                return
+            # no header yet, all lines so far are before it
+            del self.lines[:]
+            if not (yield 0):
+                return
 
     def patch_fan_on_off(self):
         self.line_index = 0
@@ -55,17 +109,19 @@ class MakerBotFlavor(PrintFile):
                 elif l.startswith(b"M126"):
                     self.lines[self.line_index] = l.replace(b"M126", b"M106")
             except IndexError:
+                if (yield self.line_index):
+                    continue
                 break
             self.line_index += 1
 
     def add_extrusion_speed_line(self, extruder_on_index):
-        # calculate mean and use it to set feed rate
-        feed_rate = statistics.mean([rate for rate, speed in self.feed_rates])
-        flow_rate = feed_rate * self.feed_rates[0][1] * self.FLOW_MULTIPLIER
+        # average the feed rates of the run and use it to set feed rate
+        flow_rate = self.feed_rates.get_flow_rate() * self.FLOW_MULTIPLIER
         self.lines.insert(extruder_on_index, b"M108 S%.1f" % float(flow_rate))
-        #print(flow_rate, self.feed_rates[0][1])
+        if self.layer_stats:
+            self.layer_stats.end_run(flow_rate)
         self.line_index += 1
-        self.feed_rates = []
+        self.feed_rates.reset()
 
     def patch_extrusion(self):
         self.line_index = 0
@@ -83,6 +139,12 @@ class MakerBotFlavor(PrintFile):
             try:
                 l, comment = self.read_line(self.line_index)
             except IndexError:
+                # lines before a started extrusion run or the last Simplify3D extruder
+                # position reset may still change
+                stable = min(i for i in (self.line_index, extruder_on_index or self.line_index,
+                                         simplify3d_extruder_position_index) if i >= 0)
+                if (yield stable):
+                    continue
                 break
             cmds = l.split()
             if cmds[0] == self.EXTRUDER_ON_CMD:
@@ -125,7 +187,9 @@ class MakerBotFlavor(PrintFile):
                     filament_pos = float(values[2])
                     extrusion_len = self.calculate_extrusion_length(prev_filament_pos, filament_pos)
                     feed_rate = self.calculate_feed_rate(path_len, extrusion_len)
-                    self.feed_rates.append((feed_rate, current_speed))
+                    self.feed_rates.add(feed_rate, current_speed, path_len, extrusion_len)
+                    if self.layer_stats:
+                        self.layer_stats.add_extrusion(path_len, extrusion_len, current_speed)
                     prev_position = position
                     prev_filament_pos = filament_pos
             elif self.SPEED_RE.match(l):
@@ -152,38 +216,71 @@ class MakerBotFlavor(PrintFile):
                     self.line_index += 1
                     extruder_on_index = 0
                 values = self.MOVE_HEAD_RE.match(l).groups()
-                prev_position = (float(values[0]), float(values[1]))
+                position = (float(values[0]), float(values[1]))
+                if self.layer_stats:
+                    path_len = self.calculate_path_length(prev_position, position)
+                    self.layer_stats.add_travel(path_len, float(values[2]))
+                prev_position = position
+            elif self.layer_stats and self.Z_MOVE_RE.match(l):
+                # new layer or a z-hop, decided by the next extrusion
+                values = self.Z_MOVE_RE.match(l).groups()
+                self.layer_stats.move_z(float(values[0]))
 
             self.line_index += 1
 
     def patch_moves(self):
         self.line_index = 0
-        current_speed = 0
-        current_z = 0
+        current_speed = b"0.0"
+        current_z = b"0.000"
+        speeds = {}
+
+        def format_coord(value):
+            return b"%.3f" % float(value)
+
+        def format_speed(value):
+            # only a handful of different feed rates in a file, format each once
+            speed = speeds.get(value)
+            if speed is None:
+                speed = speeds[value] = b"%.1f" % float(value)
+            return speed
 
         def get_move_gcode(x, y, z, speed):
-            return b"G1 X%.3f Y%.3f Z%.3f F%.1f" % (x, y, z, speed)
+            return b"G1 X%s Y%s Z%s F%s" % (x, y, z, speed)
 
         while True:
             try:
                 l, comment = self.read_line(self.line_index)
             except IndexError:
+                if (yield self.line_index):
+                    continue
                 break
+            values = self.FIXED_POINT_MOVE_RE.match(l)
+            if values and (values.group(3) or values.group(4)):
+                # coordinates can be copied as they are
+                x, y, extrusion, speed = values.groups()
+                if not extrusion:
+                    self.lines[self.line_index] = get_move_gcode(x, y, current_z, format_speed(speed))
+                else:
+                    if speed:
+                        current_speed = format_speed(speed)
+                    self.lines[self.line_index] = get_move_gcode(x, y, current_z, current_speed)
+                self.line_index += 1
+                continue
             cmds = l.split()
             if self.Z_MOVE_RE.match(l):
                 values = self.Z_MOVE_RE.match(l)
-                current_z = float(values.groups()[0])
+                current_z = format_coord(values.groups()[0])
                 self.delete_line(self.line_index)
             elif self.EXTRUSION_MOVE_RE.match(l):
                 if cmds[-1].startswith(b"F"):
                     values = self.EXTRUSION_MOVE_SPEED_RE.match(l).groups()
-                    current_speed = float(values[3])
+                    current_speed = format_speed(values[3])
                 else:
                     values = self.EXTRUSION_MOVE_RE.match(l).groups()
-                self.lines[self.line_index] = get_move_gcode(float(values[0]), float(values[1]), current_z, current_speed)
+                self.lines[self.line_index] = get_move_gcode(format_coord(values[0]), format_coord(values[1]), current_z, current_speed)
             elif self.MOVE_HEAD_RE.match(l):
                 values = self.MOVE_HEAD_RE.match(l).groups()
-                self.lines[self.line_index] = get_move_gcode(float(values[0]), float(values[1]), current_z, float(values[2]))
+                self.lines[self.line_index] = get_move_gcode(format_coord(values[0]), format_coord(values[1]), current_z, format_speed(values[2]))
             self.line_index += 1
 
     def check_temp_change(self):
@@ -193,6 +290,8 @@ class MakerBotFlavor(PrintFile):
             try:
                 l, comment = self.read_line(self.line_index)
             except IndexError:
+                if (yield self.line_index):
+                    continue
                 break
             cmds = l.split()
             if cmds[0] == self.EXTRUDER_ON_CMD:
@@ -0,0 +1,98 @@
+import logging
+import os
+import time
+
+log = logging.getLogger("Cubifier")
+
+READ_SIZE = 1024 * 1024
+POLL_INTERVAL = 0.2
+
+
+def wait_for_first_line(gcode_file, timeout):
+    # the slicer is detected from the first line, wait until it's written
+    start = time.time()
+    while True:
+        try:
+            with open(gcode_file, "rb") as gf:
+                if b"\n" in gf.read(4096):
+                    return True
+        except OSError:
+            pass
+        if time.time() - start > timeout:
+            return False
+        time.sleep(POLL_INTERVAL)
+
+
+def is_being_written(gcode_file):
+    # True if some process has the file open for writing, None if that can't be checked
+    if not os.path.isdir("/proc/self/fdinfo"):
+        return None
+    file_stat = os.stat(gcode_file)
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        fd_dir = os.path.join("/proc", pid, "fd")
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                fd_stat = os.stat(os.path.join(fd_dir, fd))
+                if (fd_stat.st_dev, fd_stat.st_ino) != (file_stat.st_dev, file_stat.st_ino):
+                    continue
+                with open(os.path.join("/proc", pid, "fdinfo", fd)) as f:
+                    for line in f:
+                        if line.startswith("flags:"):
+                            # O_WRONLY or O_RDWR
+                            if int(line.split()[1], 8) & 3:
+                                return True
+                            break
+            except (OSError, ValueError, IndexError):
+                continue
+    return False
+
+
+def follow_lines(gcode_file, idle_timeout, end_markers=None):
+    """
+    Reads a file that is still being written, like tail -f. Yields lists of stripped, non-empty
+    lines as soon as they are complete. The slicer is considered done when the file hasn't
+    grown for idle_timeout seconds and no process has it open for writing anymore. A warning
+    is logged if none of the lines starting with end_markers, written by the slicer at the
+    end of a print, was seen.
+    """
+    end_markers = tuple(end_markers or [])
+    end_seen = not end_markers
+    with open(gcode_file, "rb") as gf:
+        rest = b""
+        last_read = time.time()
+        while True:
+            data = gf.read(READ_SIZE)
+            if data:
+                last_read = time.time()
+                data = rest + data
+                end = data.rfind(b"\n") + 1
+                rest = data[end:]
+                lines = [l.strip() for l in data[:end].split(b"\n")]
+                lines = [l for l in lines if l]
+                if not end_seen:
+                    end_seen = any(l.startswith(end_markers) for l in lines)
+                yield lines
+            elif time.time() - last_read > idle_timeout:
+                # a complete file (idle_timeout 0) isn't waited for
+                if idle_timeout and is_being_written(gcode_file):
+                    log.info("%s hasn't grown in %s seconds but is still open for writing, waiting" %
+                             (gcode_file, idle_timeout))
+                    last_read = time.time()
+                    continue
+                break
+            else:
+                time.sleep(POLL_INTERVAL)
+        log.debug("No new data in %s seconds, %s is complete" % (idle_timeout, gcode_file))
+        rest = rest.strip()
+        if rest:
+            if not end_seen:
+                end_seen = rest.startswith(end_markers)
+            yield [rest]
+        if not end_seen:
+            log.warning("End of print not found in %s, the file may be incomplete" % gcode_file)
@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+from CubePostprocessor.base import ENGINE_MEMORY, ENGINE_COMPACT, ENGINE_STREAMING
+
+log = logging.getLogger("Cubifier")
+
+# Peak memory use per byte of input. Measured with tracemalloc on Slic3r, Simplify3D, KISSlicer
+# and Cura files of 6-20 MB, rounded up.
+ENGINE_MEMORY_USE = [(ENGINE_MEMORY, 6),
+                     (ENGINE_COMPACT, 3)]
+AVAILABLE_MEMORY_SHARE = 0.5 # leave room for the encoder and other jobs
+# Passes insert and remove lines in a list of the whole file, which gets slower than linear.
+# Above this size streaming is faster even when the file fits in memory, measured on Slic3r files.
+STREAMING_FILE_SIZE = 8 * 1024 * 1024
+
+
+class MemoryLimitExceeded(Exception):
+    pass
+
+
+def get_rss():
+    # current resident set size in kB, None if the platform doesn't tell
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def get_available_memory():
+    # memory available for new processes in kB, None if the platform doesn't tell
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def choose_engine(file_size, memory_budget=None):
+    """
+    Pick the fastest engine that fits the file in memory_budget (MB) and in a share of the
+    available memory. Returns the engine and the reason for the choice.
+    """
+    if file_size > STREAMING_FILE_SIZE:
+        return ENGINE_STREAMING, "file is larger than %.0f MB, streaming is faster" % (
+            STREAMING_FILE_SIZE / 1024 / 1024)
+    limits = []
+    if memory_budget:
+        limits.append((memory_budget * 1024 * 1024, "memory budget"))
+    available = get_available_memory()
+    if available is not None:
+        limits.append((available * 1024 * AVAILABLE_MEMORY_SHARE, "%d%% of available memory" %
+                       (AVAILABLE_MEMORY_SHARE * 100)))
+    if not limits:
+        return ENGINE_MEMORY, "available memory is not known and no budget was given"
+    limit, limit_name = min(limits)
+    for engine, use in ENGINE_MEMORY_USE:
+        needed = file_size * use
+        if needed <= limit:
+            return engine, "needs about %.0f MB, %s is %.0f MB" % (needed / 1024 / 1024, limit_name,
+                                                                  limit / 1024 / 1024)
+    return ENGINE_STREAMING, "in memory processing would need about %.0f MB, %s is %.0f MB" % (
+        file_size * ENGINE_MEMORY_USE[-1][1] / 1024 / 1024, limit_name, limit / 1024 / 1024)
+
+
+def get_peak_rss():
+    # peak resident set size in kB of this process
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # macOS reports bytes
+        peak //= 1024
+    return peak
+
+
+def get_process_peak_rss(pid):
+    # peak resident set size in kB of a running process, None if the platform doesn't tell
+    try:
+        with open("/proc/%s/status" % pid) as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def run_measured(args, interval=0.05):
+    """
+    Runs a command, returns its exit code and its peak resident set size in kB, sampled while
+    it runs (None if not known). The rusage of a finished child can't be used, its peak starts
+    from the size of this process when it was forked.
+    """
+    proc = subprocess.Popen(args)
+    peak = None
+    while proc.poll() is None:
+        rss = get_process_peak_rss(proc.pid)
+        # a process that is exiting has already released its memory
+        if rss is not None and proc.poll() is None:
+            peak = max(peak or 0, rss)
+        try:
+            proc.wait(interval)
+        except subprocess.TimeoutExpired:
+            pass
+    return proc.returncode, peak
+
+
+class MemoryMonitor:
+    """
+    Samples memory use after each processing stage. With trace=True tracemalloc is used to
+    get the Python heap use and peak of each stage. If max_memory (MB) is given, exceeding it
+    raises MemoryLimitExceeded. The same limit is set as the data segment limit where supported,
+    so that a single huge allocation inside a stage fails with MemoryError instead of exhausting
+    the node.
+    """
+
+    def __init__(self, trace=False, max_memory=None):
+        self.trace = trace
+        self.max_memory = max_memory
+        self.samples = []
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if max_memory and resource is not None and hasattr(resource, "RLIMIT_DATA"):
+            limit = max_memory * 1024 * 1024
+            soft, hard = resource.getrlimit(resource.RLIMIT_DATA)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_DATA, (limit, hard))
+
+    def sample(self, stage, **extra):
+        # extra values like the peak of a child process are added to the sample
+        sample = {"stage": stage,
+                  "rss_kb": get_rss(),
+                  "peak_rss_kb": get_peak_rss()}
+        sample.update(extra)
+        if self.trace:
+            current, peak = tracemalloc.get_traced_memory()
+            sample["traced_kb"] = current // 1024
+            sample["traced_peak_kb"] = peak // 1024
+            # next sample reports the peak of its own stage
+            tracemalloc.reset_peak()
+        self.samples.append(sample)
+        log.info("Memory after %s: %s" % (stage, self.format_sample(sample)))
+        self.check_limit(stage, sample)
+        return sample
+
+    def format_sample(self, sample):
+        def mb(key):
+            return "%.1f MB" % (sample[key] / 1024)
+
+        parts = []
+        if sample["rss_kb"] is not None:
+            parts.append("rss %s" % mb("rss_kb"))
+        if sample["peak_rss_kb"] is not None:
+            parts.append("peak rss %s" % mb("peak_rss_kb"))
+        if sample.get("encoder_peak_rss_kb") is not None:
+            parts.append("encoder peak rss %s" % mb("encoder_peak_rss_kb"))
+        if "traced_kb" in sample:
+            parts.append("traced %s (stage peak %s)" % (mb("traced_kb"), mb("traced_peak_kb")))
+        return ", ".join(parts) or "not available"
+
+    def check_limit(self, stage, sample):
+        if not self.max_memory:
+            return
+        used = sample["rss_kb"]
+        if used is None:
+            used = sample["peak_rss_kb"]
+        if used is not None and used > self.max_memory * 1024:
+            raise MemoryLimitExceeded("%.1f MB used after %s, limit is %s MB" %
+                                      (used / 1024, stage, self.max_memory))
+
+    def write_summary(self, summary_file):
+        peaks = [s["peak_rss_kb"] for s in self.samples if s["peak_rss_kb"] is not None]
+        summary = {"max_memory_mb": self.max_memory,
+                   "peak_rss_kb": max(peaks) if peaks else None,
+                   "stages": self.samples}
+        with open(summary_file, "w") as f:
+            json.dump(summary, f, indent=2)
+        log.info("Wrote memory summary: %s" % summary_file)
@@ -0,0 +1,360 @@
+"""
+Cubifier service. Keeps a pool of warm worker processes and accepts jobs over a local HTTP API:
+
+    POST /jobs                  {"filename": "/path/to/file.gcode", "keep": false, "stats": null}
+    GET  /jobs/<id>             job state, result file and timings
+    GET  /jobs/<id>/result      the .cube file of a finished job
+    GET  /metrics               queue depth, job counts and latencies
+
+Only files under the root directory are accepted. Every worker process runs one job at a time
+and jobs wait in the service until a worker is free, so a worker dying (killed for memory use,
+crashed) fails only the job it was running. The worker is then replaced with a new one.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from CubePostprocessor import cubifier
+from CubePostprocessor import memory
+
+log = logging.getLogger("Cubifier")
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+
+def init_worker(debug):
+    log.setLevel(logging.DEBUG if debug else logging.INFO)
+
+
+def warm_up():
+    return os.getpid()
+
+
+def run_job(gcode_file, keep_intermediary, stats_format, max_memory, log_file):
+    # runs in a worker process, returns (cube file, error, run time)
+    start = time.time()
+    job_log = logging.FileHandler(log_file)
+    job_log.setFormatter(logging.Formatter(fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    log.addHandler(job_log)
+    try:
+        memory_monitor = None
+        if max_memory:
+            memory_monitor = memory.MemoryMonitor(max_memory=max_memory)
+        cube_file = cubifier.cubify(gcode_file, keep_intermediary, memory_monitor=memory_monitor,
+                                    stats_format=stats_format, memory_budget=max_memory)
+        if not cube_file:
+            return None, "Processing failed, see %s" % log_file, time.time() - start
+        return cube_file, None, time.time() - start
+    except cubifier.UnsupportedFileError as e:
+        log.error(e)
+        return None, str(e), time.time() - start
+    except MemoryError:
+        # answered after the except block, when the traceback and the lines it holds are freed
+        pass
+    except Exception as e:
+        log.exception("Job for %s failed" % gcode_file)
+        return None, str(e), time.time() - start
+    finally:
+        log.removeHandler(job_log)
+        job_log.close()
+    return None, "Could not allocate memory within the limit of %s MB" % max_memory, time.time() - start
+
+
+class Worker:
+    # a single warm worker process
+
+    def __init__(self, debug):
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=1, initializer=init_worker,
+                                                               initargs=(debug,))
+        self.pid = self.executor.submit(warm_up).result()
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class Job:
+
+    def __init__(self, job_id, filename, keep, stats, log_file):
+        self.id = job_id
+        self.filename = filename
+        self.keep = keep
+        self.stats = stats
+        self.log_file = log_file
+        self.state = STATE_QUEUED
+        self.worker = None
+        self.cube_file = None
+        self.error = None
+        self.submitted = time.time()
+        self.run_time = None
+        self.latency = None
+
+    def to_dict(self):
+        return {"id": self.id,
+                "state": self.state,
+                "filename": self.filename,
+                "cube_file": self.cube_file,
+                "error": self.error,
+                "log_file": self.log_file,
+                "run_time": self.run_time,
+                "latency": self.latency}
+
+
+class CubifierService:
+    """
+    Worker pool with a bounded job queue. At most workers + queue_size jobs are accepted at
+    a time, further submissions are rejected until jobs finish. Jobs can only be submitted for
+    files under root_dir, their logs are written to log_dir.
+    """
+
+    def __init__(self, workers, queue_size, root_dir, log_dir, max_memory=None, debug=False, history=1000):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.root_dir = os.path.realpath(root_dir)
+        self.log_dir = log_dir
+        self.max_memory = max_memory
+        self.debug = debug
+        self.history = history
+        os.makedirs(log_dir, exist_ok=True)
+        self.idle_workers = []
+        self.queue = collections.deque()
+        self.jobs = collections.OrderedDict()
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_last = None
+
+    def warm_up(self):
+        # start all worker processes now instead of on the first jobs
+        self.idle_workers = [Worker(self.debug) for _ in range(self.workers)]
+        log.info("Started %s workers" % len(self.idle_workers))
+
+    def is_allowed(self, filename):
+        path = os.path.realpath(filename)
+        return os.path.commonpath([self.root_dir, path]) == self.root_dir
+
+    def submit(self, filename, keep=False, stats=None):
+        with self.lock:
+            if self.pending >= self.workers + self.queue_size:
+                self.rejected += 1
+                return None
+            job_id = next(self.ids)
+            job = Job(job_id, filename, keep, stats, os.path.join(self.log_dir, "job_%s.log" % job_id))
+            self.jobs[job.id] = job
+            self.pending += 1
+            self.queue.append(job)
+            self.forget_old_jobs()
+        log.info("Queued job %s: %s" % (job.id, filename))
+        self.dispatch()
+        return job
+
+    def dispatch(self):
+        # start queued jobs on idle workers
+        while True:
+            with self.lock:
+                if not self.queue or not self.idle_workers:
+                    return
+                job = self.queue.popleft()
+                job.worker = self.idle_workers.pop()
+                job.state = STATE_RUNNING
+            self.start_job(job)
+
+    def start_job(self, job):
+        try:
+            future = job.worker.executor.submit(run_job, job.filename, job.keep, job.stats, self.max_memory,
+                                                job.log_file)
+        except BrokenProcessPool:
+            # the worker died while idle
+            job.error = "Worker process died before the job started"
+            self.job_finished(job, self.replace_worker(job.worker))
+            return
+        future.add_done_callback(lambda future: self.job_done(job, future))
+
+    def replace_worker(self, worker):
+        log.warning("Worker %s died, starting a new one" % worker.pid)
+        worker.shutdown(wait=False)
+        try:
+            return Worker(self.debug)
+        except Exception as e:
+            log.error("Could not start a new worker: %s" % e)
+            return None
+
+    def job_done(self, job, future):
+        worker = job.worker
+        try:
+            job.cube_file, job.error, job.run_time = future.result()
+        except BrokenProcessPool:
+            job.error = "Worker process died while running the job"
+            worker = self.replace_worker(worker)
+        except Exception as e:
+            # the worker was shut down
+            job.error = str(e) or e.__class__.__name__
+        self.job_finished(job, worker)
+
+    def job_finished(self, job, worker):
+        with self.lock:
+            job.latency = time.time() - job.submitted
+            job.state = STATE_FAILED if job.error else STATE_DONE
+            job.worker = None
+            if worker:
+                self.idle_workers.append(worker)
+            self.pending -= 1
+            if job.error:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self.latency_sum += job.latency
+            self.latency_max = max(self.latency_max, job.latency)
+            self.latency_last = job.latency
+        log.info("Job %s %s in %.2f s" % (job.id, job.state, job.latency))
+        self.dispatch()
+
+    def forget_old_jobs(self):
+        # keep the job table bounded, drop the oldest finished jobs
+        finished = [job_id for job_id, job in self.jobs.items() if job.state in (STATE_DONE, STATE_FAILED)]
+        for job_id in finished[:max(0, len(self.jobs) - self.history)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def get_metrics(self):
+        with self.lock:
+            finished = self.completed + self.failed
+            return {"workers": self.workers,
+                    "queue_size": self.queue_size,
+                    "queue_depth": len(self.queue),
+                    "running": self.pending - len(self.queue),
+                    "completed": self.completed,
+                    "failed": self.failed,
+                    "rejected": self.rejected,
+                    "latency_mean": self.latency_sum / finished if finished else None,
+                    "latency_max": self.latency_max if finished else None,
+                    "latency_last": self.latency_last}
+
+    def shutdown(self):
+        with self.lock:
+            workers = self.idle_workers + [job.worker for job in self.jobs.values() if job.worker]
+            self.idle_workers = []
+            self.queue.clear()
+        for worker in workers:
+            worker.shutdown()
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+
+    service = None
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_job_from_path(self, parts):
+        try:
+            return self.service.get_job(int(parts[1]))
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts == ["metrics"]:
+            return self.send_json(200, self.service.get_metrics())
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.get_job_from_path(parts)
+            if not job:
+                return self.send_json(404, {"error": "No such job"})
+            if len(parts) == 2:
+                return self.send_json(200, job.to_dict())
+            if parts[2] == "result":
+                if job.state != STATE_DONE:
+                    return self.send_json(409, {"error": "Job is %s" % job.to_dict()["state"]})
+                return self.send_file(job.cube_file)
+        self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path.strip("/") != "jobs":
+            return self.send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            filename = os.path.abspath(request["filename"])
+        except (ValueError, KeyError, TypeError):
+            return self.send_json(400, {"error": "Expected json with a filename"})
+        if not self.service.is_allowed(filename):
+            return self.send_json(400, {"error": "Only files under %s are accepted" % self.service.root_dir})
+        if not os.path.isfile(filename):
+            return self.send_json(400, {"error": "No such file: %s" % filename})
+        if request.get("stats") not in (None, "json", "csv"):
+            return self.send_json(400, {"error": "stats must be json or csv"})
+        job = self.service.submit(filename, bool(request.get("keep")), request.get("stats"))
+        if not job:
+            return self.send_json(503, {"error": "Job queue is full"})
+        self.send_json(202, job.to_dict())
+
+    def send_file(self, filename):
+        try:
+            with open(filename, "rb") as f:
+                body = f.read()
+        except OSError as e:
+            return self.send_json(500, {"error": str(e)})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Disposition", 'attachment; filename="%s"' % os.path.basename(filename))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s" % (self.address_string(), format % args))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='cubifier serve', description='Run cubifier as a local service')
+    parser.add_argument('--host', default='127.0.0.1', help = 'address to listen on')
+    parser.add_argument('-p', '--port', type=int, default=8632, help = 'port to listen on')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help = 'number of worker processes')
+    parser.add_argument('-q', '--queue-size', type=int, default=32,
+                        help = 'number of jobs waiting for a worker before new jobs are rejected')
+    parser.add_argument('-r', '--root', default='.', metavar='DIR',
+                        help = 'only accept files under this directory, default is the current directory')
+    parser.add_argument('-l', '--log-dir', default='cubifier-logs', metavar='DIR',
+                        help = 'directory for the job logs')
+    parser.add_argument('--max-memory', type=int, metavar='MB', help = 'memory limit of a single job')
+    parser.add_argument('-d', '--debug', action='store_true', help = 'enable debugging mode')
+    args = parser.parse_args(argv)
+
+    cubifier.setup_logging(args.debug)
+    service = CubifierService(args.workers, args.queue_size, args.root, args.log_dir, args.max_memory, args.debug)
+    service.warm_up()
+    handler = type("Handler", (RequestHandler,), {"service": service})
+    httpd = ThreadingHTTPServer((args.host, args.port), handler)
+    log.info("Listening on http://%s:%s, accepting files under %s" % (args.host, args.port, service.root_dir))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.shutdown()
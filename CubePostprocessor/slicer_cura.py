@@ -9,16 +9,13 @@ class CuraPrintFile(PrintFile):
 
     slicer_type = SLICER_CURA
     LAYER_START_RE = re.compile(b';LAYER:')
+    PASSES = [#"patch_auto_retraction",
+              "patch_first_layer_temp"]
+    END_MARKERS = [b";End GCode", b";CURA_PROFILE_STRING"]
 
     def __init__(self, debug=False):
         super().__init__(debug=debug)
 
-    def process(self, gcode_file):
-        self.open_file(gcode_file)
-        #self.patch_auto_retraction()
-        self.patch_first_layer_temp()
-        return self.save_new_file()
-
     def patch_auto_retraction(self):
         # remove retraction setting. Cube uses it's own setting for this apparently, so disable Cura's option
         # NOT NEEDE probably, Cura's setting seems to work
@@ -64,6 +61,10 @@ class CuraPrintFile(PrintFile):
             try:
                 l = self.lines[index]
             except IndexError:
+                # the temperature line is patched when the first layer starts
+                stable = index if temp_index is None else min(index, temp_index)
+                if (yield stable):
+                    continue
                 break
             if self.LAYER_START_RE.match(l):
                 layer_nr += 1
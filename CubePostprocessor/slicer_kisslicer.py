@@ -17,6 +17,11 @@ class KissPrintFile(PrintFile):
                         INFILL_SETTING_KEY,
                         LOOPS_INSIDEOUT]
     HEADER_STOP = b"*** G-code Prefix ***"
+    END_MARKERS = [b"; *** G-code Postfix ***"]
+    SETTING_LINE_RE = re.compile(b"^.*(?:" + b"|".join(map(re.escape, SETTINGS_TO_READ)) + b").*$", re.MULTILINE)
+    PASSES = ["read_initial_settings",
+              "patch_solid_extrusion",
+              "patch_infill_extrusion"]
 
     LAYER_BEGIN_RE = re.compile(b"; BEGIN_LAYER_OBJECT")
     LAYER_END_RE = re.compile(b"; END_LAYER_OBJECT")
@@ -36,18 +41,33 @@ class KissPrintFile(PrintFile):
         def read_setting_value(line):
             return line.split(b"=")[1].strip()
 
-        for l in self.lines:
-            if l.count(self.HEADER_STOP):
+        index = 0
+        while True:
+            # find the end of the header first, then search the new header lines at once
+            end = len(self.lines)
+            stop = None
+            for i in range(index, end):
+                if self.HEADER_STOP in self.lines[i]:
+                    stop = i
+                    break
+            header = b"\n".join(self.lines[i] for i in range(index, end if stop is None else stop))
+            for match in self.SETTING_LINE_RE.finditer(header):
+                l = match.group()
+                for setting in self.SETTINGS_TO_READ:
+                    if l.count(setting):
+                        self.settings[setting] = read_setting_value(l)
+            if stop is not None:
+                return
+            index = end
+            # the next passes need the settings, hold all lines until they are read
+            if not (yield 0):
                 return
-            for setting in self.SETTINGS_TO_READ:
-                if l.count(setting):
-                    self.settings[setting] = read_setting_value(l)
 
     def patch_solid_extrusion(self):
-        self.patch_extrusion(self.SOLID_START_RE, self.SOLID_SETTING_KEY, "solid")
+        return self.patch_extrusion(self.SOLID_START_RE, self.SOLID_SETTING_KEY, "solid")
 
     def patch_infill_extrusion(self):
-        self.patch_extrusion(self.INFILL_START_RE, self.INFILL_SETTING_KEY, "infill")
+        return self.patch_extrusion(self.INFILL_START_RE, self.INFILL_SETTING_KEY, "infill")
 
     def patch_extrusion(self, start_re, setting_key, _type):
         multiplier = 1.0
@@ -65,7 +85,13 @@ class KissPrintFile(PrintFile):
         section_start = False
 
         index = 0
-        while index < len(self.lines):
+        while True:
+            if index >= len(self.lines):
+                # the last extrusion speed line may still change
+                stable = index if last_extrusion_speed_line is None else min(index, last_extrusion_speed_line)
+                if (yield stable):
+                    continue
+                break
             l = self.lines[index]
             if l.startswith(self.EXTRUSION_SPEED_CMD):
                 last_extrusion_speed = l
@@ -112,11 +138,4 @@ class KissPrintFile(PrintFile):
             elif self.LAYER_END_RE.match(l):
                 self._patch_perimeter(layer_start, index)
 
-            index += 1
-
-    def process(self, gcode_file):
-        self.open_file(gcode_file)
-        self.read_initial_settings()
-        self.patch_solid_extrusion()
-        self.patch_infill_extrusion()
-        return self.save_new_file()
\ No newline at end of file
+            index += 1
\ No newline at end of file
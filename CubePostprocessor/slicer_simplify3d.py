@@ -12,43 +12,45 @@ class Simplify3dPrintFile(MakerBotFlavor):
     slicer_type = SLICER_SIMPLIFY3D
     # Tune this to make filament flow fit your needs
     FLOW_MULTIPLIER = 0.365 # ok for MK8 drive gear
+    PASSES = MakerBotFlavor.PASSES + ["remove_unused_cmds"]
+    END_MARKERS = [b"; Build Summary"]
 
     def __init__(self, debug=False):
         super().__init__(debug=debug)
 
 
-    def process(self, gcode_file):
-        self.open_file(gcode_file)
-        self.check_header()
-        self.patch_extrusion()
-        self.patch_moves()
-        self.patch_fan_on_off()
-        self.check_temp_change()
-        self.remove_unused_cmds()
-        return self.save_new_file()
-
-
     def check_header(self):
         # Read temperature setting and replace it belowe Cube header
         self.line_index = 0
 
-        header = False
         temp_line = None
         while True:
+            # keep the last temperature line before the header and remove the rest with one slice
+            header_index = self.find_line(b"^")
+            preamble_end = len(self.lines) if header_index is None else header_index
+            index = self.find_line(self.EXTRUDER_TEMP_CMD, 0, preamble_end)
+            while index is not None:
+                temp_line = self.lines[index].split(b";", 1)[0].strip()
+                index = self.find_line(self.EXTRUDER_TEMP_CMD, index + 1, preamble_end)
+            del self.lines[:preamble_end]
+            if header_index is not None:
+                break
+            if not (yield 0):
+                return
+
+        while True:
+            index = self.find_line(self.EXTRUDER_TEMP_CMD, self.line_index)
+            if index is None:
+                self.line_index = len(self.lines)
+                if (yield self.line_index):
+                    continue
+                return
+            self.line_index = index
+            l, comment = self.read_line(index)
             try:
-                l, comment = self.read_line()
-                if l.startswith(b"^"):
-                    # set flag
-                    header = True
-                elif l.startswith(self.EXTRUDER_TEMP_CMD):
-                    if not header:
-                        temp_line = l
-                        self.delete_line()
-                    elif l.split()[1] == b"SFIRST_LAYER":
-                        self.lines[self.line_index] = temp_line
-                        break
-                elif not header:
-                    self.delete_line(self.line_index)
+                if l.split()[1] == b"SFIRST_LAYER":
+                    self.lines[index] = temp_line
+                    return
             except IndexError:
-                break
+                return
             self.line_index += 1
\ No newline at end of file
@@ -7,6 +7,7 @@ class Slic3rPrintFile(MakerBotFlavor):
     slicer_type = SLICER_SLIC3R
     # Tune this to make filament flow fit your needs
     FLOW_MULTIPLIER = 0.365 # ok for MK8 drive gear
+    END_MARKERS = [b"; filament used"]
 
     def __init__(self, debug=False):
         super().__init__(debug=debug)
@@ -0,0 +1,148 @@
+import csv
+import json
+import logging
+import math
+
+log = logging.getLogger("Cubifier")
+
+FILAMENT_DIAMETER = 1.75 # Cube 2 filament
+
+
+class LayerStats:
+    """
+    Per layer totals collected while the extrusion is patched. Every layer is a fixed set of
+    counters, extrusion runs are folded into the layer they belong to as they end. A layer
+    starts with the first extrusion above the previous layer, so Z moves of retract lifts
+    (z-hops) don't start layers.
+    """
+
+    FIELDS = ["layer",
+              "z",
+              "runs",
+              "extrusion_mm",
+              "volume_mm3",
+              "extrusion_path_mm",
+              "longest_run_mm",
+              "travel_mm",
+              "flow_min",
+              "flow_max",
+              "flow_mean",
+              "time_s"]
+
+    def __init__(self):
+        self.layers = []
+        self.layer = None
+        self.z = None
+        # travel before the first layer or above the current one, belongs to the next layer or is a z-hop
+        self.raised_travel = 0.0
+        self.raised_time = 0.0
+        self.run_path = 0.0
+        self.flow_sum = 0.0
+
+    def start_layer(self, z):
+        self.end_layer()
+        self.layer = {"layer": len(self.layers),
+                      "z": z,
+                      "runs": 0,
+                      "extrusion_mm": 0.0,
+                      "volume_mm3": 0.0,
+                      "extrusion_path_mm": 0.0,
+                      "longest_run_mm": 0.0,
+                      "travel_mm": 0.0,
+                      "flow_min": None,
+                      "flow_max": None,
+                      "flow_mean": None,
+                      "time_s": 0.0}
+        self.layers.append(self.layer)
+        self.run_path = 0.0
+        self.flow_sum = 0.0
+
+    def move_z(self, z):
+        self.z = z
+
+    def is_new_layer(self):
+        if self.layer is None:
+            return True
+        return self.z is not None and (self.layer["z"] is None or self.z > self.layer["z"])
+
+    def end_layer(self):
+        if self.layer and self.layer["runs"]:
+            self.layer["flow_mean"] = self.flow_sum / self.layer["runs"]
+
+    def get_time(self, path_len, speed):
+        # speed is in mm/min
+        if speed:
+            return path_len / speed * 60
+        return 0.0
+
+    def add_time(self, path_len, speed):
+        self.layer["time_s"] += self.get_time(path_len, speed)
+
+    def add_raised_travel(self):
+        self.layer["travel_mm"] += self.raised_travel
+        self.layer["time_s"] += self.raised_time
+        self.raised_travel = 0.0
+        self.raised_time = 0.0
+
+    def add_extrusion(self, path_len, extrusion_len, speed):
+        if self.is_new_layer():
+            self.start_layer(self.z)
+        self.add_raised_travel()
+        self.layer["extrusion_mm"] += extrusion_len
+        self.layer["extrusion_path_mm"] += path_len
+        self.run_path += path_len
+        self.add_time(path_len, speed)
+
+    def add_travel(self, path_len, speed):
+        if self.is_new_layer():
+            # before the first layer or above the current one
+            self.raised_travel += path_len
+            self.raised_time += self.get_time(path_len, speed)
+            return
+        self.layer["travel_mm"] += path_len
+        self.add_time(path_len, speed)
+
+    def end_run(self, flow_rate):
+        if self.layer is None:
+            self.start_layer(self.z)
+        layer = self.layer
+        layer["runs"] += 1
+        layer["longest_run_mm"] = max(layer["longest_run_mm"], self.run_path)
+        if layer["flow_min"] is None or flow_rate < layer["flow_min"]:
+            layer["flow_min"] = flow_rate
+        if layer["flow_max"] is None or flow_rate > layer["flow_max"]:
+            layer["flow_max"] = flow_rate
+        self.flow_sum += flow_rate
+        self.run_path = 0.0
+
+    def rounded(self, values):
+        return dict((key, round(value, 3) if isinstance(value, float) else value)
+                    for key, value in values.items())
+
+    def get_totals(self):
+        if self.layer:
+            # travel after the last extrusion
+            self.add_raised_travel()
+        self.end_layer()
+        area = math.pi * (FILAMENT_DIAMETER / 2) ** 2
+        for layer in self.layers:
+            layer["volume_mm3"] = layer["extrusion_mm"] * area
+        totals = {"layers": len(self.layers)}
+        for key in ("runs", "extrusion_mm", "volume_mm3", "extrusion_path_mm", "travel_mm", "time_s"):
+            totals[key] = sum(layer[key] for layer in self.layers)
+        return totals
+
+    def write_json(self, stats_file):
+        totals = self.get_totals()
+        with open(stats_file, "w") as f:
+            json.dump({"totals": self.rounded(totals),
+                       "layers": [self.rounded(layer) for layer in self.layers]}, f)
+        log.info("Wrote layer statistics: %s" % stats_file)
+
+    def write_csv(self, stats_file):
+        self.get_totals()
+        with open(stats_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rounded(layer) for layer in self.layers)
+        log.info("Wrote layer statistics: %s" % stats_file)
@@ -0,0 +1,85 @@
+; CURA
+;FLAVOR:BFB
+M104 S200
+M108 S40.0
+;some comment
+
+M104 S200
+;LAYER:0
+M108 S28.5
+M101
+G1 X15.033 Y-39.131 Z0.300 F1800.0
+G1 X19.634 Y44.305 Z0.300 F1800.0
+G1 X-9.411 Y-47.927 Z0.300 F1800.0
+G1 X51.662 Y-58.389 Z0.300 F1800.0
+G1 X44.631 Y-43.356 Z0.300 F1800.0
+M103
+M108 S32.4
+M101
+G1 X43.494 Y-37.827 Z0.300 F1800.0
+G1 X-55.891 Y-57.553 Z0.300 F1800.0
+G1 X7.960 Y9.393 Z0.300 F1800.0
+G1 X49.660 Y-0.268 Z0.300 F1800.0
+M103
+;LAYER:1
+M108 S53.0
+M101
+G1 X9.039 Y50.236 Z0.500 F1800.0
+G1 X-6.423 Y-58.304 Z0.500 F1800.0
+G1 X-13.543 Y11.036 Z0.500 F1800.0
+G1 X52.526 Y57.694 Z0.500 F1800.0
+G1 X-2.946 Y-10.510 Z0.500 F1800.0
+M103
+M108 S24.1
+M101
+G1 X-34.527 Y-41.788 Z0.500 F1800.0
+G1 X-58.136 Y-59.426 Z0.500 F1800.0
+G1 X22.051 Y-45.399 Z0.500 F1800.0
+G1 X55.962 Y-49.423 Z0.500 F1800.0
+G1 X44.346 Y-44.524 Z0.500 F1800.0
+M103
+;LAYER:2
+M108 S31.0
+M101
+G1 X-30.928 Y28.027 Z0.700 F1800.0
+G1 X-37.511 Y-53.983 Z0.700 F1800.0
+G1 X32.883 Y25.626 Z0.700 F1800.0
+G1 X42.659 Y27.567 Z0.700 F1800.0
+G1 X-49.885 Y15.435 Z0.700 F1800.0
+G1 X25.108 Y-4.730 Z0.700 F1800.0
+M103
+M108 S57.3
+M101
+G1 X49.623 Y-53.681 Z0.700 F1800.0
+G1 X-56.164 Y-52.734 Z0.700 F1800.0
+G1 X46.000 Y22.397 Z0.700 F1800.0
+G1 X14.187 Y-13.326 Z0.700 F1800.0
+M103
+;LAYER:3
+M108 S49.2
+M101
+G1 X54.924 Y40.190 Z0.900 F1800.0
+G1 X13.074 Y-22.046 Z0.900 F1800.0
+G1 X53.851 Y27.332 Z0.900 F1800.0
+M103
+M108 S38.8
+M101
+G1 X-42.611 Y35.683 Z0.900 F1800.0
+G1 X-16.408 Y17.387 Z0.900 F1800.0
+G1 X15.565 Y-9.844 Z0.900 F1800.0
+M103
+M108 S35.4
+M101
+G1 X53.391 Y34.155 Z0.900 F1800.0
+G1 X8.018 Y-24.913 Z0.900 F1800.0
+G1 X-52.723 Y56.874 Z0.900 F1800.0
+G1 X24.392 Y39.289 Z0.900 F1800.0
+G1 X-20.155 Y12.699 Z0.900 F1800.0
+M103
+M108 S59.1
+M101
+G1 X12.136 Y-22.968 Z0.900 F1800.0
+G1 X-8.573 Y46.575 Z0.900 F1800.0
+G1 X-14.799 Y22.179 Z0.900 F1800.0
+M103
+;End GCode
\ No newline at end of file
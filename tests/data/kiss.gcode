@@ -0,0 +1,196 @@
+; KISSlicer - PRO
+; bed_C = 105
+; destring_speed_mm_per_s = 90
+; loops_insideout = 1
+; other = 3
+; *** G-code Prefix ***
+M104 S210
+^Firmware:V2.08
+^DRM:000000000000
+^Cube:2
+^Type:1
+^Time:18
+^Material:-1
+M227 P100 S100
+M107
+M204 S10
+; BEGIN_LAYER_OBJECT z=0.00
+; 'Sparse Infill Path'
+M108 S31.3
+; extruder on
+M101
+G1 X-21.417 Y-27.837 Z0.300 F1800.0
+G1 X-41.126 Y50.472 Z0.300 F1800.0
+; extruder(s) off
+M103
+; 'Solid Path'
+M108 S31.5
+; extruder on
+M101
+G1 X37.410 Y44.065 Z0.300 F1800.0
+G1 X8.629 Y-27.138 Z0.300 F1800.0
+G1 X42.142 Y36.844 Z0.300 F1800.0
+; extruder(s) off
+M103
+; 'Perimeter Path'
+M108 S51.1
+; extruder on
+M101
+G1 X-18.378 Y-49.792 Z0.300 F1800.0
+G1 X6.441 Y35.687 Z0.300 F1800.0
+G1 X-35.948 Y30.022 Z0.300 F1800.0
+G1 X51.807 Y-31.916 Z0.300 F1800.0
+G1 X12.828 Y21.319 Z0.300 F1800.0
+; extruder(s) off
+M103
+; END_LAYER_OBJECT
+; BEGIN_LAYER_OBJECT z=0.20
+; 'Perimeter Path'
+M108 S28.3
+; extruder on
+M101
+G1 X10.367 Y-58.876 Z0.500 F1800.0
+G1 X-13.803 Y4.867 Z0.500 F1800.0
+G1 X4.338 Y-17.387 Z0.500 F1800.0
+G1 X-52.484 Y-12.218 Z0.500 F1800.0
+; extruder(s) off
+M103
+; 'Perimeter Path'
+M108 S55.9
+; extruder on
+M101
+G1 X-21.481 Y0.740 Z0.500 F1800.0
+G1 X-35.776 Y-34.477 Z0.500 F1800.0
+G1 X-48.937 Y36.704 Z0.500 F1800.0
+G1 X-25.224 Y9.344 Z0.500 F1800.0
+G1 X-16.933 Y33.557 Z0.500 F1800.0
+G1 X42.834 Y-30.443 Z0.500 F1800.0
+; extruder(s) off
+M103
+; 'Sparse Infill Path'
+M108 S35.0
+; extruder on
+M101
+G1 X-15.400 Y-4.388 Z0.500 F1800.0
+G1 X-50.191 Y-22.105 Z0.500 F1800.0
+; extruder(s) off
+M103
+; 'Solid Path'
+M108 S33.8
+; extruder on
+M101
+G1 X12.856 Y-48.710 Z0.500 F1800.0
+G1 X-35.443 Y44.492 Z0.500 F1800.0
+G1 X7.857 Y10.405 Z0.500 F1800.0
+G1 X-34.370 Y51.059 Z0.500 F1800.0
+G1 X-26.421 Y-48.347 Z0.500 F1800.0
+G1 X-6.377 Y11.174 Z0.500 F1800.0
+; extruder(s) off
+M103
+; 'Perimeter Path'
+M108 S58.5
+; extruder on
+M101
+G1 X41.250 Y-19.339 Z0.500 F1800.0
+G1 X59.354 Y-14.616 Z0.500 F1800.0
+G1 X-56.698 Y-55.823 Z0.500 F1800.0
+G1 X-15.644 Y24.668 Z0.500 F1800.0
+; extruder(s) off
+M103
+; END_LAYER_OBJECT
+; BEGIN_LAYER_OBJECT z=0.40
+; 'Solid Path'
+M108 S54.5
+; extruder on
+M101
+G1 X50.659 Y24.765 Z0.700 F1800.0
+G1 X-49.205 Y-21.755 Z0.700 F1800.0
+G1 X-32.015 Y-49.226 Z0.700 F1800.0
+G1 X50.506 Y0.780 Z0.700 F1800.0
+G1 X-38.080 Y41.963 Z0.700 F1800.0
+; extruder(s) off
+M103
+; 'Sparse Infill Path'
+M108 S58.6
+; extruder on
+M101
+G1 X-39.345 Y53.006 Z0.700 F1800.0
+G1 X52.940 Y-52.887 Z0.700 F1800.0
+G1 X6.340 Y-56.666 Z0.700 F1800.0
+; extruder(s) off
+M103
+; 'Solid Path'
+M108 S30.3
+; extruder on
+M101
+G1 X25.153 Y17.602 Z0.700 F1800.0
+G1 X58.251 Y-53.308 Z0.700 F1800.0
+G1 X-42.624 Y30.594 Z0.700 F1800.0
+G1 X52.726 Y21.227 Z0.700 F1800.0
+G1 X-24.145 Y10.976 Z0.700 F1800.0
+G1 X30.948 Y-47.350 Z0.700 F1800.0
+; extruder(s) off
+M103
+; 'Sparse Infill Path'
+M108 S34.9
+; extruder on
+M101
+G1 X-45.103 Y-2.242 Z0.700 F1800.0
+G1 X-39.771 Y-31.385 Z0.700 F1800.0
+G1 X-42.822 Y21.317 Z0.700 F1800.0
+G1 X-58.486 Y26.067 Z0.700 F1800.0
+G1 X-36.588 Y-55.678 Z0.700 F1800.0
+; extruder(s) off
+M103
+; 'Solid Path'
+M108 S23.1
+; extruder on
+M101
+G1 X44.010 Y46.645 Z0.700 F1800.0
+G1 X-43.228 Y-6.331 Z0.700 F1800.0
+G1 X-48.362 Y51.453 Z0.700 F1800.0
+G1 X41.070 Y15.404 Z0.700 F1800.0
+G1 X-5.720 Y-19.227 Z0.700 F1800.0
+G1 X38.767 Y-2.695 Z0.700 F1800.0
+; extruder(s) off
+M103
+; END_LAYER_OBJECT
+; BEGIN_LAYER_OBJECT z=0.60
+; 'Solid Path'
+M108 S33.3
+; extruder on
+M101
+G1 X-38.371 Y-5.835 Z0.900 F1800.0
+G1 X46.718 Y-7.323 Z0.900 F1800.0
+; extruder(s) off
+M103
+; 'Solid Path'
+M108 S30.7
+; extruder on
+M101
+G1 X-30.389 Y-56.950 Z0.900 F1800.0
+G1 X8.519 Y-24.414 Z0.900 F1800.0
+G1 X36.497 Y-28.719 Z0.900 F1800.0
+G1 X-46.891 Y-5.258 Z0.900 F1800.0
+G1 X-2.108 Y-41.596 Z0.900 F1800.0
+; extruder(s) off
+M103
+; 'Perimeter Path'
+M108 S22.3
+; extruder on
+M101
+G1 X7.193 Y40.234 Z0.900 F1800.0
+G1 X-45.697 Y30.582 Z0.900 F1800.0
+G1 X56.484 Y-8.153 Z0.900 F1800.0
+; extruder(s) off
+M103
+; 'Sparse Infill Path'
+M108 S59.9
+; extruder on
+M101
+G1 X-48.292 Y-25.269 Z0.900 F1800.0
+G1 X47.544 Y-53.102 Z0.900 F1800.0
+G1 X27.177 Y-24.777 Z0.900 F1800.0
+; extruder(s) off
+M103
+; END_LAYER_OBJECT
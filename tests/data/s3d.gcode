@@ -0,0 +1,209 @@
+; G-Code generated by Simplify3D(R) Version 3.0.2
+; setting_0 = 0
+; setting_1 = 1
+; setting_2 = 2
+; setting_3 = 3
+; setting_4 = 4
+
+M104 S215 ; preamble temp
+G90
+^Firmware:V2.08
+^DRM:000000000000
+^Cube:2
+^Type:1
+^Time:18
+^Material:-1
+M227 P100 S100
+M107
+M204 S10
+M104 SFIRST_LAYER
+G4 P90
+M108 S40.0
+;LAYER 0
+G1 Z0.300 F7800.000
+G1 X51.372 Y-38.047 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X23.053 Y-41.842 E0.04550 F1800 ; perimeter
+G1 X-50.518 Y-30.323 E0.09978
+G1 X57.631 Y-28.213 E0.18267
+G1 X-6.364 Y14.437 E0.25744
+G1 X-45.460 Y8.026 E0.38448
+G1 X-30.559 Y9.394 E0.41436
+G1 X-32.234 Y58.915 E0.56323
+G1 X-24.7587 Y-37.251 E0.68610
+G1 E-1.31390 F2400.00000 ; retract
+G1 X56.756 Y9.983 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-6.106 Y-28.806 E0.12992 F1500.000 ; perimeter
+G1 X-15.755 Y-29.410 E0.22291
+G1 E-1.77709 F2400.00000 ; retract
+G1 X11.931 Y18.197 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-10.921 Y-15.383 E0.12282 F900.5 ; perimeter
+G1 X-11.020 Y-41.454 E0.19717
+G1 X58.589 Y-53.837 E0.25683
+G1 E-1.74317 F2400.00000 ; retract
+G1 X29.441 Y46.043 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X59.594 Y-16.346 E0.12964 F1800 ; perimeter
+G1 X-41.212 Y9.335 E0.27094
+G1 X-42.900 Y36.776 E0.29043 F3000.000 ; perimeter
+G1 X-42.494 Y51.060 E0.34606
+G1 X-36.319 Y57.066 E0.46678
+G1 E-1.53322 F2400.00000 ; retract
+;LAYER 1
+G1 Z0.500 F7800.000
+G1 X-22.257 Y12.917 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X14.441 Y38.947 E0.13563 F1800 ; perimeter
+G1 X-36.466 Y-54.994 E0.22879
+G1 X56.483 Y46.064 E0.28267
+G1 X-13.220 Y33.370 E0.38286
+G1 X-15.906 Y-59.579 E0.42025
+G1 X38.276 Y-11.959 E0.48727
+G1 X0.521 Y-44.367 E0.54207
+G1 E-1.45793 F2400.00000 ; retract
+G1 X50.655 Y-22.353 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X0.471 Y-14.656 E0.00814 F1800 ; perimeter
+G1 F1200.000
+G1 X-36.755 Y54.797 E0.11795
+G1 X-52.138 Y-40.948 E0.23621
+G1 X0.266 Y-28.456 E0.35855
+G1 X-40.652 Y47.450 E0.36408
+G1 X16.358 Y6.622 E0.38134
+G1 X15.573 Y-28.230 E0.39703
+G1 E-1.60297 F2400.00000 ; retract
+G1 X58.860 Y9.283 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-32.394 Y13.845 E0.01221 F1500.000 ; perimeter
+G1 X44.436 Y27.965 E0.05872
+G1 X-9.878 Y-1.393 E0.10236
+G1 X-23.551 Y-10.411 E0.11052
+G1 E-1.88948 F2400.00000 ; retract
+G1 X-23.861 Y-43.953 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-43.830 Y52.391 E0.07124 F1800 ; perimeter
+G1 X19.857 Y56.056 E0.08079
+G1 X9.417 Y-0.858 E0.21469
+G1 X-56.973 Y-37.721 E0.21469 F1800 ; perimeter
+G1 E-1.78531 F2400.00000 ; retract
+G1 X-52.994 Y33.465 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-36.329 Y-10.419 E0.09852 F3000.000 ; perimeter
+G1 X-54.181 Y25.848 E0.14493
+G1 E-1.85507 F2400.00000 ; retract
+G1 X-59.238 Y41.332 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X18.664 Y-38.953 E0.01207 F1500.000 ; perimeter
+G1 X51.021 Y-53.696 E0.03056
+G1 X56.627 Y47.301 E0.13342
+G1 X41.007 Y49.795 E0.15889
+G1 X42.231 Y40.982 E0.24907
+G1 X-56.818 Y54.684 E0.32866 F1800 ; perimeter
+G1 X-50.664 Y-56.772 E0.36046
+G1 E-1.63954 F2400.00000 ; retract
+;LAYER 2
+G1 Z0.700 F7800.000
+G1 X14.636 Y-40.583 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-43.392 Y17.225 E0.00463 F1500.000 ; perimeter
+G1 X-16.391 Y46.954 E0.01450
+G1 X-47.146 Y-55.869 E0.15166
+G1 E-1.84834 F2400.00000 ; retract
+G1 X41.726 Y37.442 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X15.871 Y-2.746 E0.11271 F1800 ; perimeter
+G1 X-29.1957 Y25.891 E0.14346
+G1 X42.165 Y-10.449 E0.28806
+G1 X4.546 Y-49.093 E0.34008
+G1 X-0.000 Y-1.101 E0.34027
+G1 X-18.338 Y53.264 E0.36795
+G1 X-46.809 Y34.550 E0.47287
+G1 E-1.52713 F2400.00000 ; retract
+G1 X23.659 Y34.432 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X51.421 Y47.021 E0.01427 F1500.000 ; perimeter
+G1 X-8.633 Y57.889 E0.07006
+G1 X22.708 Y9.790 E0.08910
+G1 X-21.200 Y-29.134 E0.15664
+G1 X0.924 Y39.183 E0.25305
+G1 X12.347 Y54.695 E0.39926
+G1 X18.948 Y-42.202 E0.54850
+G1 E-1.45150 F2400.00000 ; retract
+;LAYER 3
+G1 Z0.900 F7800.000
+M104 S210
+M127
+G1 X27.995 Y-7.809 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-26.303 Y46.230 E0.13671 F3000.000 ; perimeter
+G1 X0.058 Y-42.982 E0.25536
+G1 X-8.397 Y-9.461 E0.36650
+G1 E-1.63350 F2400.00000 ; retract
+G1 X-32.572 Y26.666 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-32.567 Y-38.219 E0.08756 F1500.000 ; perimeter
+G1 X-9.650 Y33.885 E0.18181 F1800 ; perimeter
+G1 X-10.879 Y-38.033 E0.25008
+G1 X5.2032 Y33.815 E0.30839
+G1 X4.924 Y16.711 E0.32355
+G1 X-34.789 Y31.524 E0.38511
+G1 X-27.077 Y-12.038 E0.43843 F1500.000 ; perimeter
+G1 X9.621 Y-11.943 E0.53271
+M104 S205
+G1 E-1.46729 F2400.00000 ; retract
+G1 X54.431 Y56.580 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-40.256 Y51.530 E0.06932 F1500.000 ; perimeter
+G1 X-32.882 Y16.656 E0.13969
+G1 X5.792 Y-17.430 E0.20991
+G1 X-0.000 Y26.615 E0.26633
+G1 X-8.581 Y-16.508 E0.31160
+G1 X48.697 Y39.759 E0.32016
+G1 X54.212 Y18.715 E0.32016 F900.5 ; perimeter
+G1 X-5.765 Y-11.702 E0.44829
+G1 E-1.55171 F2400.00000 ; retract
+G1 X4.143 Y13.142 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X20.215 Y47.270 E0.11719 F900.5 ; perimeter
+G1 X-7.370 Y-28.261 E0.19681
+G1 X-3.949 Y-42.669 E0.27077 F3000.000 ; perimeter
+G1 X-40.757 Y-0.287 E0.36071
+G1 X21.114 Y17.583 E0.42459
+G1 F1200.000
+G1 X57.806 Y47.707 E0.56431
+G1 X43.403 Y3.065 E0.65810
+G1 E-1.34190 F2400.00000 ; retract
+G1 X32.469 Y-34.713 F7800.000 ; move to first point
+G92 E0
+G1 E0.00000 F2400.00000 ; unretract
+G1 X-53.674 Y-25.302 E0.03774 F900.5 ; perimeter
+G1 X0.771 Y35.034 E0.11330
+G1 X16.179 Y26.721 E0.15818
+G1 X-59.255 Y13.042 E0.16564
+G1 X14.004 Y11.557 E0.30211
+G1 E-1.69789 F2400.00000 ; retract
+M127
+M104 S0
+G28 X0
+M18
+; end
+; filament used = 1000.0mm
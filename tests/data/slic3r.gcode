@@ -0,0 +1,277 @@
+; generated by Slic3r 1.2.9 on 2016-01-01 at 12:00:00
+; setting_0 = 0
+; setting_1 = 1
+; setting_2 = 2
+; setting_3 = 3
+; setting_4 = 4
+
+^Firmware:V2.08
+^DRM:000000000000
+^Cube:2
+^Type:1
+^Time:18
+^Material:-1
+M227 P100 S100
+M107
+M204 S10
+M104 S215
+G4 P90
+M104 S220
+M108 S40.0
+M126
+M82
+;LAYER 0
+G1 Z0.300 F7800.000
+G1 X53.744 Y-12.621 F7800.000 ; move to first point
+G1 E0.00000 F2400.00000 ; unretract
+M101
+G1 X-16.117 Y-53.040 E0.08038 F1800 ; perimeter
+G1 X-9.058 Y39.222 E0.09086 F1500.000 ; perimeter
+M103
+G1 E-1.90914 F2400.00000 ; retract
+G1 X53.694 Y15.675 F7800.000 ; move to first point
+G1 E0.09086 F2400.00000 ; unretract
+M101
+G1 X-12.398 Y57.151 E0.17743 F1500.000 ; perimeter
+G1 X8.510 Y-47.633 E0.24030
+G1 X7.724 Y3.806 E0.25491
+G1 X-30.189 Y-50.177 E0.39343
+G1 X13.075 Y-40.205 E0.44495
+G1 X-50.686 Y38.202 E0.50820
+M103
+G1 E-1.49180 F2400.00000 ; retract
+G1 X-19.185 Y-17.979 F7800.000 ; move to first point
+G1 E0.50820 F2400.00000 ; unretract
+M101
+G1 X40.796 Y53.362 E0.57663 F3000.000 ; perimeter
+G1 X9.354 Y25.995 E0.68631
+G1 X13.310 Y-25.508 E0.82741
+G1 X-40.036 Y-43.569 E0.96493
+G1 X21.927 Y-50.042 E1.07089
+M103
+G1 E-0.92911 F2400.00000 ; retract
+G1 X-41.844 Y19.022 F7800.000 ; move to first point
+G1 E1.07089 F2400.00000 ; unretract
+M101
+G1 X-28.470 Y-59.509 E1.15926 F3000.000 ; perimeter
+G1 X43.104 Y28.774 E1.20705
+M103
+G1 E-0.79295 F2400.00000 ; retract
+G1 X-5.203 Y44.518 F7800.000 ; move to first point
+G1 E1.20705 F2400.00000 ; unretract
+M101
+G1 X-12.232 Y-12.706 E1.29094 F3000.000 ; perimeter
+G1 X-40.524 Y-59.972 E1.30104
+G1 X44.920 Y13.688 E1.35558 F1800 ; perimeter
+G1 X-46.158 Y-2.353 E1.44592
+G1 X-2.565 Y-35.374 E1.55838
+G1 X30.977 Y-49.079 E1.66189
+G1 X-33.265 Y16.373 E1.79812
+G1 X-31.273 Y-36.010 E1.91187
+M103
+G1 E-0.08813 F2400.00000 ; retract
+;LAYER 1
+G1 Z0.500 F7800.000
+G1 X-17.332 Y-56.522 F7800.000 ; move to first point
+G1 E1.91187 F2400.00000 ; unretract
+M101
+G1 X-36.763 Y12.617 E1.98271 F900.5 ; perimeter
+G1 X-16.244 Y-36.395 E2.13091
+M103
+G1 E0.13091 F2400.00000 ; retract
+G1 X-35.475 Y14.888 F7800.000 ; move to first point
+G1 E2.13091 F2400.00000 ; unretract
+M101
+G1 X18.357 Y35.957 E2.20284 F1500.000 ; perimeter
+G1 X-36.082 Y16.301 E2.26112
+G1 X29.202 Y59.173 E2.36939
+G1 F2400.000
+G1 X39.181 Y-17.951 E2.49036
+G1 X17.961 Y-7.943 E2.49250
+G1 X-24.844 Y-28.876 E2.52416
+M103
+G1 E0.52416 F2400.00000 ; retract
+G1 X-9.718 Y-44.271 F7800.000 ; move to first point
+G1 E2.52416 F2400.00000 ; unretract
+M101
+G1 X10.002 Y48.516 E2.59288 F3000.000 ; perimeter
+G1 X1.266 Y13.027 E2.61250
+G1 X-45.560 Y3.687 E2.63373
+G1 X-37.043 Y-54.936 E2.76621 F1500.000 ; perimeter
+G1 X-6.810 Y1.459 E2.88021
+G1 X52.980 Y53.062 E2.96021
+G1 X-43.544 Y-51.294 E3.10170
+M103
+G1 E1.10170 F2400.00000 ; retract
+G1 X-31.123 Y-51.226 F7800.000 ; move to first point
+G1 E3.10170 F2400.00000 ; unretract
+M101
+G1 X33.232 Y52.741 E3.12005 F900.5 ; perimeter
+G1 X54.300 Y58.785 E3.26518
+G1 X-19.306 Y26.658 E3.32991
+G1 F2400.000
+G1 X2.092 Y-46.458 E3.43538
+G1 X-27.370 Y48.708 E3.56684 F1800 ; perimeter
+G1 X38.277 Y50.301 E3.63018
+G1 X22.585 Y-8.962 E3.64360 F1500.000 ; perimeter
+M103
+G1 E1.64360 F2400.00000 ; retract
+G1 X-27.729 Y-57.980 F7800.000 ; move to first point
+G1 E3.64360 F2400.00000 ; unretract
+M101
+G1 X42.747 Y-52.005 E3.65616 F1500.000 ; perimeter
+G1 X-27.857 Y-31.388 E3.73912
+M103
+G1 E1.73912 F2400.00000 ; retract
+G1 X-46.866 Y-40.626 F7800.000 ; move to first point
+G1 E3.73912 F2400.00000 ; unretract
+M101
+G1 X15.441 Y3.730 E3.87896 F1800 ; perimeter
+G1 X-0.000 Y27.970 E3.90564
+M103
+G1 E1.90564 F2400.00000 ; retract
+;LAYER 2
+G1 Z0.700 F7800.000
+G1 X57.366 Y1.708 F7800.000 ; move to first point
+G1 E3.90564 F2400.00000 ; unretract
+M101
+G1 X38.270 Y-8.139 E3.92158 F3000.000 ; perimeter
+G1 X-34.178 Y45.831 E4.06713
+G1 X15.0538 Y-8.311 E4.21555
+M103
+G1 E2.21555 F2400.00000 ; retract
+G1 X-53.352 Y19.827 F7800.000 ; move to first point
+G1 E4.21555 F2400.00000 ; unretract
+M101
+G1 X-26.168 Y-30.934 E4.31613 F900.5 ; perimeter
+G1 X-16.303 Y-20.529 E4.35648 F900.5 ; perimeter
+G1 X-59.872 Y0.332 E4.40291
+G1 X-49.230 Y-57.301 E4.40366
+G1 X30.065 Y45.491 E4.49149
+M103
+G1 E2.49149 F2400.00000 ; retract
+G1 X-13.258 Y-20.864 F7800.000 ; move to first point
+G1 E4.49149 F2400.00000 ; unretract
+M101
+G1 X17.186 Y-54.745 E4.60012 F3000.000 ; perimeter
+G1 X0.525 Y39.169 E4.62101
+G1 X-44.0288 Y-47.410 E4.72345
+G1 X-0.000 Y35.724 E4.81761
+G1 X-52.074 Y-51.066 E4.89789
+M103
+G1 E2.89789 F2400.00000 ; retract
+G1 X-28.133 Y27.520 F7800.000 ; move to first point
+G1 E4.89789 F2400.00000 ; unretract
+M101
+G1 X-4.759 Y41.464 E4.99538 F1500.000 ; perimeter
+G1 X17.132 Y-29.527 E5.11043
+G1 X-52.721 Y-27.747 E5.19559 F1500.000 ; perimeter
+M103
+G1 E3.19559 F2400.00000 ; retract
+G1 X23.062 Y21.085 F7800.000 ; move to first point
+G1 E5.19559 F2400.00000 ; unretract
+M101
+G1 X-4.092 Y32.060 E5.23842 F1800 ; perimeter
+G1 X-50.824 Y59.276 E5.30937
+G1 X-49.164 Y29.698 E5.44895 F900.5 ; perimeter
+G1 X46.423 Y47.725 E5.57198
+M103
+G1 E3.57198 F2400.00000 ; retract
+G1 X-1.663 Y-57.020 F7800.000 ; move to first point
+G1 E5.57198 F2400.00000 ; unretract
+M101
+G1 X-11.350 Y27.262 E5.67422 F3000.000 ; perimeter
+G1 X30.088 Y40.693 E5.80025 F1500.000 ; perimeter
+M103
+G1 E3.80025 F2400.00000 ; retract
+G1 X52.786 Y-36.511 F7800.000 ; move to first point
+G1 E5.80025 F2400.00000 ; unretract
+M101
+G1 X-15.333 Y-12.852 E5.84373 F1500.000 ; perimeter
+G1 X-47.795 Y40.161 E5.88500 F900.5 ; perimeter
+M103
+G1 E3.88500 F2400.00000 ; retract
+;LAYER 3
+G1 Z0.900 F7800.000
+M104 S210
+M127
+G1 X52.271 Y-30.081 F7800.000 ; move to first point
+G1 E5.88500 F2400.00000 ; unretract
+M101
+G1 X32.782 Y34.217 E5.93234 F3000.000 ; perimeter
+G1 X52.884 Y-54.063 E6.02697
+G1 X51.2132 Y-3.338 E6.13988
+G1 X-28.780 Y6.879 E6.25073
+M103
+G1 E4.25073 F2400.00000 ; retract
+G1 X-12.676 Y-39.920 F7800.000 ; move to first point
+G1 E6.25073 F2400.00000 ; unretract
+M101
+G1 X37.419 Y6.046 E6.32582 F3000.000 ; perimeter
+G1 X-36.911 Y-49.069 E6.39331
+G1 X29.959 Y2.900 E6.47876
+M103
+M104 S205
+G1 E4.47876 F2400.00000 ; retract
+G1 X-14.776 Y-19.416 F7800.000 ; move to first point
+G1 E6.47876 F2400.00000 ; unretract
+M101
+G1 X-16.783 Y22.410 E6.56490 F1800 ; perimeter
+G1 X-8.180 Y56.165 E6.62258
+M103
+G1 E4.62258 F2400.00000 ; retract
+G1 X-44.730 Y-8.976 F7800.000 ; move to first point
+G1 E6.62258 F2400.00000 ; unretract
+M101
+G1 X10.461 Y-59.979 E6.69357 F3000.000 ; perimeter
+G1 X-6.126 Y-41.752 E6.77275
+G1 X41.581 Y33.223 E6.89656
+G1 F1200.000
+G1 X-23.546 Y16.355 E7.03455
+G1 X9.947 Y12.127 E7.04510
+G1 F1800.000
+G1 X40.729 Y5.640 E7.08689
+G1 F1800.000
+G1 X-0.203 Y20.936 E7.13300 F3000.000 ; perimeter
+G1 X-0.847 Y-16.522 E7.19665
+M103
+G1 E5.19665 F2400.00000 ; retract
+G1 X-12.437 Y-59.190 F7800.000 ; move to first point
+G1 E7.19665 F2400.00000 ; unretract
+M101
+G1 X-35.374 Y56.383 E7.27238 F900.5 ; perimeter
+G1 X46.720 Y13.212 E7.34215
+G1 X11.376 Y50.631 E7.47871 F1500.000 ; perimeter
+G1 X-52.784 Y-12.801 E7.50000 F900.5 ; perimeter
+M103
+G1 E5.50000 F2400.00000 ; retract
+G1 X27.927 Y59.704 F7800.000 ; move to first point
+G1 E7.50000 F2400.00000 ; unretract
+M101
+G1 X52.306 Y29.557 E7.52782 F1500.000 ; perimeter
+G1 X-6.908 Y-50.308 E7.65369
+G1 X-14.384 Y36.472 E7.73786
+M103
+G1 E5.73786 F2400.00000 ; retract
+G1 X-49.469 Y24.631 F7800.000 ; move to first point
+G1 E7.73786 F2400.00000 ; unretract
+M101
+G1 X-36.837 Y-16.290 E7.87579 F3000.000 ; perimeter
+G1 X-52.4904 Y-29.158 E7.99756
+G1 X54.923 Y25.996 E8.04842
+M103
+G1 E6.04842 F2400.00000 ; retract
+G1 X-22.022 Y-26.924 F7800.000 ; move to first point
+G1 E8.04842 F2400.00000 ; unretract
+M101
+G1 X36.679 Y53.579 E8.13776 F1500.000 ; perimeter
+G1 F1200.000
+G1 X33.163 Y37.776 E8.24509
+M103
+G1 E6.24509 F2400.00000 ; retract
+M127
+M104 S0
+G28 X0
+M18
+; end
+; filament used = 1000.0mm
@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from CubePostprocessor import follow
+from CubePostprocessor import memory
+from CubePostprocessor.base import ENGINE_MEMORY, ENGINE_COMPACT, ENGINE_STREAMING
+from CubePostprocessor.cubifier import detect_file_type
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+GCODE_FILES = ["slic3r.gcode", "s3d.gcode", "cura.gcode", "kiss.gcode"]
+MB = 1024 * 1024
+
+
+class EngineOutputTest(unittest.TestCase):
+    # every engine has to produce the same file from the same input
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def process(self, gcode_name, engine):
+        gcode_file = os.path.join(self.tmp_dir, "%s_%s" % (engine, gcode_name))
+        shutil.copy(os.path.join(DATA_DIR, gcode_name), gcode_file)
+        pf = detect_file_type(gcode_file)()
+        result_file = pf.process(gcode_file, engine)
+        self.assertNotEqual(result_file, 1)
+        with open(result_file, "rb") as f:
+            return f.read()
+
+    def test_engines_give_identical_output(self):
+        for gcode_name in GCODE_FILES:
+            with self.subTest(gcode_name):
+                expected = self.process(gcode_name, ENGINE_MEMORY)
+                self.assertTrue(expected)
+                self.assertEqual(self.process(gcode_name, ENGINE_COMPACT), expected)
+                self.assertEqual(self.process(gcode_name, ENGINE_STREAMING), expected)
+
+    def test_streaming_small_chunks(self):
+        # lines split over many reads, passes see partial headers and extrusion runs
+        for gcode_name in GCODE_FILES:
+            with self.subTest(gcode_name):
+                expected = self.process(gcode_name, ENGINE_MEMORY)
+                with mock.patch.object(follow, "READ_SIZE", 97):
+                    self.assertEqual(self.process(gcode_name, ENGINE_STREAMING), expected)
+
+    def test_streaming_missing_file(self):
+        gcode_file = os.path.join(self.tmp_dir, "missing.gcode")
+        pf = detect_file_type(os.path.join(DATA_DIR, "slic3r.gcode"))()
+        self.assertEqual(pf.process(gcode_file, ENGINE_STREAMING), 1)
+        self.assertFalse(os.path.exists(pf.get_new_file_name()))
+
+    def test_memory_error_leaves_no_output(self):
+        def out_of_memory(pf):
+            yield 0
+            raise MemoryError()
+
+        for engine in (ENGINE_MEMORY, ENGINE_COMPACT, ENGINE_STREAMING):
+            with self.subTest(engine):
+                gcode_file = os.path.join(self.tmp_dir, "%s_slic3r.gcode" % engine)
+                shutil.copy(os.path.join(DATA_DIR, "slic3r.gcode"), gcode_file)
+                pf = detect_file_type(gcode_file)()
+                with mock.patch.object(type(pf), "remove_comments", out_of_memory):
+                    with self.assertRaises(MemoryError):
+                        pf.process(gcode_file, engine)
+                self.assertFalse(os.path.exists(pf.get_new_file_name()))
+                self.assertEqual(len(pf.lines), 0)
+
+
+class ChooseEngineTest(unittest.TestCase):
+
+    def choose(self, file_size, memory_budget=None, available_kb=None):
+        with mock.patch.object(memory, "get_available_memory", return_value=available_kb):
+            return memory.choose_engine(file_size, memory_budget)
+
+    def test_no_limits(self):
+        engine, reason = self.choose(1 * MB)
+        self.assertEqual(engine, ENGINE_MEMORY)
+        self.assertIn("not known", reason)
+
+    def test_memory(self):
+        engine, reason = self.choose(1 * MB, memory_budget=10)
+        self.assertEqual(engine, ENGINE_MEMORY)
+        self.assertIn("memory budget", reason)
+
+    def test_compact(self):
+        self.assertEqual(self.choose(3 * MB, memory_budget=10)[0], ENGINE_COMPACT)
+
+    def test_streaming(self):
+        engine, reason = self.choose(5 * MB, memory_budget=10)
+        self.assertEqual(engine, ENGINE_STREAMING)
+        self.assertIn("in memory processing would need", reason)
+
+    def test_large_file_is_streamed(self):
+        # fits in memory, but streaming is faster
+        engine, reason = self.choose(memory.STREAMING_FILE_SIZE + 1, memory_budget=10000,
+                                     available_kb=10000 * 1024)
+        self.assertEqual(engine, ENGINE_STREAMING)
+        self.assertIn("streaming is faster", reason)
+        self.assertEqual(self.choose(memory.STREAMING_FILE_SIZE, memory_budget=10000)[0], ENGINE_MEMORY)
+
+    def test_available_memory(self):
+        # half of 20 MB available
+        engine, reason = self.choose(2 * MB, available_kb=20 * 1024)
+        self.assertEqual(engine, ENGINE_COMPACT)
+        self.assertIn("available memory", reason)
+
+    def test_lower_limit_is_used(self):
+        self.assertEqual(self.choose(1 * MB, memory_budget=100, available_kb=10 * 1024)[0], ENGINE_COMPACT)
+        self.assertEqual(self.choose(4 * MB, memory_budget=5, available_kb=10000 * 1024)[0], ENGINE_STREAMING)
+
+if __name__ == "__main__":
+    unittest.main()
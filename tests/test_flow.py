@@ -0,0 +1,110 @@
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import unittest
+
+from CubePostprocessor.flavor_makerbot import FlowRateAccumulator, FLOW_AVERAGE_MEAN, FLOW_AVERAGE_WEIGHTED
+from CubePostprocessor.slicer_slic3r import Slic3rPrintFile
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+FALLBACK_RATE = 0.005 # calculate_feed_rate for segments without path or extrusion
+
+
+class FlowRateAccumulatorTest(unittest.TestCase):
+
+    def test_mean(self):
+        # same as the list of feed rates averaged with statistics.mean it replaces
+        random.seed(1)
+        accumulator = FlowRateAccumulator(FLOW_AVERAGE_MEAN)
+        rates = []
+        for i in range(1000):
+            rate = random.uniform(0.001, 0.2)
+            rates.append(rate)
+            accumulator.add(rate, random.choice([900.0, 1800.0]) if i else 1500.0,
+                            random.uniform(0, 5), random.uniform(0, 0.5))
+        self.assertEqual(len(accumulator), 1000)
+        self.assertAlmostEqual(accumulator.get_flow_rate(), statistics.mean(rates) * 1500.0, places=9)
+
+    def test_mean_keeps_fallback(self):
+        accumulator = FlowRateAccumulator(FLOW_AVERAGE_MEAN)
+        accumulator.add(0.1, 1000.0, 2.0, 0.2)
+        accumulator.add(FALLBACK_RATE, 1000.0, 0.0, 0.0)
+        self.assertAlmostEqual(accumulator.get_flow_rate(), (0.1 + FALLBACK_RATE) / 2 * 1000.0)
+
+    def test_weighted(self):
+        # (feed rate, speed, path length)
+        segments = [(0.1, 1000.0, 10.0),
+                    (0.05, 2000.0, 1.0),
+                    (0.2, 500.0, 4.0)]
+        accumulator = FlowRateAccumulator(FLOW_AVERAGE_WEIGHTED)
+        for rate, speed, path_len in segments:
+            accumulator.add(rate, speed, path_len, rate * path_len)
+        expected = (0.1 * 1000.0 * 10.0 + 0.05 * 2000.0 * 1.0 + 0.2 * 500.0 * 4.0) / 15.0
+        self.assertAlmostEqual(accumulator.get_flow_rate(), expected)
+        # a short fast segment doesn't count as much as in the mean
+        self.assertNotAlmostEqual(accumulator.get_flow_rate(), (0.1 + 0.05 + 0.2) / 3 * 1000.0)
+
+    def test_skip_fallback(self):
+        accumulator = FlowRateAccumulator(FLOW_AVERAGE_MEAN, skip_fallback=True)
+        # the speed of the run comes from the first segment, also when it's a fallback one
+        accumulator.add(FALLBACK_RATE, 1200.0, 0.0, 0.1)
+        accumulator.add(0.1, 1000.0, 2.0, 0.2)
+        accumulator.add(FALLBACK_RATE, 1000.0, 3.0, 0.0)
+        accumulator.add(0.3, 1000.0, 1.0, 0.3)
+        self.assertEqual(len(accumulator), 4)
+        self.assertAlmostEqual(accumulator.get_flow_rate(), (0.1 + 0.3) / 2 * 1200.0)
+
+    def test_all_fallback(self):
+        for averaging in (FLOW_AVERAGE_MEAN, FLOW_AVERAGE_WEIGHTED):
+            with self.subTest(averaging):
+                accumulator = FlowRateAccumulator(averaging, skip_fallback=True)
+                accumulator.add(FALLBACK_RATE, 1500.0, 0.0, 0.0)
+                accumulator.add(FALLBACK_RATE, 900.0, 2.0, 0.0)
+                self.assertAlmostEqual(accumulator.get_flow_rate(), FALLBACK_RATE * 1500.0)
+
+    def test_reset(self):
+        accumulator = FlowRateAccumulator(FLOW_AVERAGE_WEIGHTED, skip_fallback=True)
+        accumulator.add(0.1, 1000.0, 2.0, 0.2)
+        accumulator.add(FALLBACK_RATE, 1000.0, 0.0, 0.0)
+        accumulator.reset()
+        self.assertEqual(len(accumulator), 0)
+        accumulator.add(0.2, 500.0, 1.0, 0.2)
+        self.assertAlmostEqual(accumulator.get_flow_rate(), 0.2 * 500.0)
+
+
+class WeightedSlic3rPrintFile(Slic3rPrintFile):
+    FLOW_AVERAGING = FLOW_AVERAGE_WEIGHTED
+    SKIP_FALLBACK_FEED_RATES = True
+
+
+class FlowAveragingOptInTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def process(self, print_type):
+        gcode_file = os.path.join(self.tmp_dir, "%s.gcode" % print_type.__name__)
+        shutil.copy(os.path.join(DATA_DIR, "slic3r.gcode"), gcode_file)
+        result_file = print_type().process(gcode_file)
+        with open(result_file, "rb") as f:
+            return f.read().splitlines()
+
+    def test_slicer_class_opts_in(self):
+        pf = WeightedSlic3rPrintFile()
+        self.assertEqual((pf.feed_rates.averaging, pf.feed_rates.skip_fallback), (FLOW_AVERAGE_WEIGHTED, True))
+        mean_lines = self.process(Slic3rPrintFile)
+        weighted_lines = self.process(WeightedSlic3rPrintFile)
+        # only the M108 speeds differ
+        self.assertEqual(len(mean_lines), len(weighted_lines))
+        changed = [(a, b) for a, b in zip(mean_lines, weighted_lines) if a != b]
+        self.assertTrue(changed)
+        self.assertTrue(all(a.startswith(b"M108") and b.startswith(b"M108") for a, b in changed))
+
+
+if __name__ == "__main__":
+    unittest.main()
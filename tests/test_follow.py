@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from CubePostprocessor import follow
+
+IDLE_TIMEOUT = 0.2
+
+
+class FollowLinesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.gcode_file = os.path.join(self.tmp_dir, "print.gcode")
+        patcher = mock.patch.object(follow, "POLL_INTERVAL", 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def follow(self, end_markers=None):
+        lines = []
+        for chunk in follow.follow_lines(self.gcode_file, IDLE_TIMEOUT, end_markers):
+            lines.extend(chunk)
+        return lines
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fdinfo"), "needs /proc to see open files")
+    def test_stalled_writer(self):
+        # the slicer stops writing for longer than the timeout but keeps the file open
+        gf = open(self.gcode_file, "wb")
+        gf.write(b"G1 X1\n")
+        gf.flush()
+
+        def write_rest():
+            time.sleep(IDLE_TIMEOUT * 4)
+            gf.write(b"G1 X2\n; filament used = 1.0mm\n")
+            gf.close()
+
+        writer = threading.Thread(target=write_rest)
+        writer.start()
+        try:
+            lines = self.follow([b"; filament used"])
+        finally:
+            writer.join()
+        self.assertEqual(lines, [b"G1 X1", b"G1 X2", b"; filament used = 1.0mm"])
+
+    def test_missing_end_marker(self):
+        with open(self.gcode_file, "wb") as gf:
+            gf.write(b"G1 X1\nG1 X2")
+        with self.assertLogs("Cubifier", "WARNING"):
+            self.assertEqual(self.follow([b"; filament used"]), [b"G1 X1", b"G1 X2"])
+
+    def test_end_marker(self):
+        with open(self.gcode_file, "wb") as gf:
+            gf.write(b"G1 X1\n; filament used = 1.0mm\n")
+        with mock.patch.object(follow.log, "warning") as warning:
+            self.follow([b"; filament used"])
+        warning.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+from CubePostprocessor import memory
+
+# allocates and touches 64 MB, then keeps running long enough to be sampled
+ALLOCATE = """
+import time
+b = bytearray(64 * 1024 * 1024)
+for i in range(0, len(b), 4096):
+    b[i] = 1
+time.sleep(0.3)
+"""
+
+
+class RunMeasuredTest(unittest.TestCase):
+
+    @unittest.skipUnless(os.path.isdir("/proc/self"), "needs /proc to sample memory use")
+    def test_peak_is_the_child_own(self):
+        # this process is larger than the child, the child's peak must not include it
+        ballast = bytearray(256 * 1024 * 1024)
+        for i in range(0, len(ballast), 4096):
+            ballast[i] = 1
+        returncode, peak = memory.run_measured([sys.executable, "-c", ALLOCATE])
+        self.assertEqual(returncode, 0)
+        self.assertGreater(peak, 64 * 1024)
+        self.assertLess(peak, 200 * 1024)
+
+    def test_exit_code(self):
+        returncode, peak = memory.run_measured([sys.executable, "-c", "import sys; sys.exit(3)"])
+        self.assertEqual(returncode, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+from CubePostprocessor import server
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+# copies the file like the real encoder, waits while the hold file exists
+FAKE_ENCODER = """#!/bin/sh
+while [ -e "$CUBIFIER_TEST_HOLD" ]; do sleep 0.02; done
+cp "$1" "$2"
+"""
+
+
+@unittest.skipUnless(os.name == "posix", "uses a shell script as the encoder")
+class CubifierServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.root_dir = os.path.join(self.tmp_dir, "root")
+        self.log_dir = os.path.join(self.tmp_dir, "logs")
+        bin_dir = os.path.join(self.tmp_dir, "bin")
+        os.makedirs(self.root_dir)
+        os.makedirs(bin_dir)
+        encoder = os.path.join(bin_dir, "cubepro-encoder")
+        with open(encoder, "w") as f:
+            f.write(FAKE_ENCODER)
+        os.chmod(encoder, 0o755)
+        self.hold_file = os.path.join(self.tmp_dir, "hold")
+        env = mock.patch.dict(os.environ, {"PATH": bin_dir + os.pathsep + os.environ.get("PATH", ""),
+                                           "CUBIFIER_TEST_HOLD": self.hold_file})
+        env.start()
+        self.addCleanup(env.stop)
+        self.service = None
+
+    def tearDown(self):
+        self.release()
+        if self.service:
+            self.service.shutdown()
+        shutil.rmtree(self.tmp_dir)
+
+    def start_service(self, workers, queue_size):
+        self.service = server.CubifierService(workers, queue_size, self.root_dir, self.log_dir)
+        self.service.warm_up()
+        return self.service
+
+    def gcode_file(self, name):
+        gcode_file = os.path.join(self.root_dir, name + ".gcode")
+        shutil.copy(os.path.join(DATA_DIR, "slic3r.gcode"), gcode_file)
+        return gcode_file
+
+    def hold(self):
+        open(self.hold_file, "w").close()
+
+    def release(self):
+        if os.path.exists(self.hold_file):
+            os.remove(self.hold_file)
+
+    def wait_for(self, condition, timeout=30):
+        end = time.time() + timeout
+        while not condition():
+            if time.time() > end:
+                self.fail("Timed out")
+            time.sleep(0.02)
+
+    def wait_for_job(self, job):
+        self.wait_for(lambda: job.state in (server.STATE_DONE, server.STATE_FAILED))
+
+    def test_job(self):
+        service = self.start_service(1, 1)
+        job = service.submit(self.gcode_file("print"))
+        self.wait_for_job(job)
+        self.assertEqual(job.state, server.STATE_DONE, job.error)
+        self.assertTrue(os.path.isfile(job.cube_file))
+        self.assertTrue(os.path.isfile(os.path.join(self.log_dir, "job_1.log")))
+        metrics = service.get_metrics()
+        self.assertEqual((metrics["completed"], metrics["failed"], metrics["queue_depth"]), (1, 0, 0))
+
+    def test_queue_limit(self):
+        service = self.start_service(1, 1)
+        self.hold()
+        jobs = [service.submit(self.gcode_file("print%s" % i)) for i in range(3)]
+        self.assertIsNone(jobs[2])
+        metrics = service.get_metrics()
+        self.assertEqual((metrics["running"], metrics["queue_depth"], metrics["rejected"]), (1, 1, 1))
+        self.release()
+        for job in jobs[:2]:
+            self.wait_for_job(job)
+            self.assertEqual(job.state, server.STATE_DONE, job.error)
+        metrics = service.get_metrics()
+        self.assertEqual((metrics["running"], metrics["queue_depth"], metrics["completed"]), (0, 0, 2))
+
+    def test_dead_worker(self):
+        # only the job of the killed worker fails, running and queued jobs finish
+        service = self.start_service(2, 2)
+        self.hold()
+        jobs = [service.submit(self.gcode_file("print%s" % i)) for i in range(3)]
+        self.wait_for(lambda: jobs[0].worker and jobs[1].worker)
+        pid = jobs[0].worker.pid
+        os.kill(pid, signal.SIGKILL)
+        self.wait_for_job(jobs[0])
+        self.assertEqual(jobs[0].state, server.STATE_FAILED)
+        self.release()
+        for job in jobs[1:]:
+            self.wait_for_job(job)
+            self.assertEqual(job.state, server.STATE_DONE, job.error)
+        # the worker was replaced
+        job = service.submit(self.gcode_file("print4"))
+        self.wait_for_job(job)
+        self.assertEqual(job.state, server.STATE_DONE, job.error)
+        self.assertNotIn(pid, [worker.pid for worker in service.idle_workers])
+        metrics = service.get_metrics()
+        self.assertEqual((metrics["completed"], metrics["failed"], metrics["running"]), (3, 1, 0))
+
+    def test_root_dir(self):
+        service = server.CubifierService(1, 1, self.root_dir, self.log_dir)
+        self.assertTrue(service.is_allowed(os.path.join(self.root_dir, "a", "print.gcode")))
+        self.assertFalse(service.is_allowed("/etc/passwd"))
+        self.assertFalse(service.is_allowed(os.path.join(self.root_dir, "..", "print.gcode")))
+        os.symlink(self.tmp_dir, os.path.join(self.root_dir, "link"))
+        self.assertFalse(service.is_allowed(os.path.join(self.root_dir, "link", "print.gcode")))
+
+    def test_http_outside_root(self):
+        service = self.start_service(1, 1)
+        outside_file = os.path.join(self.tmp_dir, "outside.gcode")
+        shutil.copy(os.path.join(DATA_DIR, "slic3r.gcode"), outside_file)
+        handler = type("Handler", (server.RequestHandler,), {"service": service})
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        request = urllib.request.Request("http://127.0.0.1:%s/jobs" % httpd.server_port,
+                                         data=json.dumps({"filename": outside_file}).encode(), method="POST")
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            urllib.request.urlopen(request)
+        self.assertEqual(cm.exception.code, 400)
+        cm.exception.close()
+        self.assertEqual(os.listdir(self.log_dir), [])
+        self.assertEqual(service.get_metrics()["completed"] + service.get_metrics()["failed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from CubePostprocessor.slicer_slic3r import Slic3rPrintFile
+from CubePostprocessor.stats import LayerStats
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class LayerStatsTest(unittest.TestCase):
+
+    def test_layers(self):
+        stats = LayerStats()
+        stats.move_z(0.3)
+        stats.add_travel(10, 600)
+        stats.add_extrusion(20, 1, 600)
+        stats.end_run(0.05)
+        stats.move_z(0.5)
+        stats.add_travel(5, 600)
+        stats.add_extrusion(20, 1, 600)
+        stats.end_run(0.05)
+        stats.get_totals()
+        self.assertEqual([layer["z"] for layer in stats.layers], [0.3, 0.5])
+        self.assertEqual([layer["travel_mm"] for layer in stats.layers], [10, 5])
+
+    def test_z_hops(self):
+        stats = LayerStats()
+        stats.move_z(0.3)
+        stats.add_extrusion(20, 1, 600)
+        stats.end_run(0.05)
+        # hop within the layer
+        stats.move_z(0.7)
+        stats.add_travel(10, 600)
+        stats.move_z(0.3)
+        stats.add_extrusion(20, 1, 600)
+        stats.end_run(0.05)
+        # hop to the next layer
+        stats.move_z(0.9)
+        stats.add_travel(5, 600)
+        stats.move_z(0.5)
+        stats.add_extrusion(20, 1, 600)
+        stats.end_run(0.05)
+        # hop after the last extrusion
+        stats.move_z(0.9)
+        stats.add_travel(3, 600)
+        totals = stats.get_totals()
+        self.assertEqual([layer["z"] for layer in stats.layers], [0.3, 0.5])
+        self.assertEqual([layer["runs"] for layer in stats.layers], [2, 1])
+        self.assertEqual([layer["travel_mm"] for layer in stats.layers], [10, 8])
+        self.assertEqual(totals["travel_mm"], 18)
+        self.assertAlmostEqual(totals["time_s"], 78 / 600 * 60)
+
+    def test_travel_before_first_layer(self):
+        stats = LayerStats()
+        stats.add_travel(10, 600)
+        stats.move_z(0.3)
+        stats.add_extrusion(20, 1, 600)
+        stats.end_run(0.05)
+        stats.get_totals()
+        self.assertEqual([(layer["z"], layer["runs"], layer["travel_mm"]) for layer in stats.layers],
+                         [(0.3, 1, 10)])
+
+
+class PatchExtrusionStatsTest(unittest.TestCase):
+    # layers of tests/data/slic3r.gcode
+    LAYER_Z = [0.3, 0.5, 0.7, 0.9]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def get_layers(self, lines):
+        gcode_file = os.path.join(self.tmp_dir, "slic3r.gcode")
+        with open(gcode_file, "wb") as f:
+            f.write(b"\n".join(lines))
+        pf = Slic3rPrintFile()
+        pf.layer_stats = LayerStats()
+        self.assertNotEqual(pf.process(gcode_file), 1)
+        pf.layer_stats.get_totals()
+        return pf.layer_stats.layers
+
+    def read_lines(self):
+        with open(os.path.join(DATA_DIR, "slic3r.gcode"), "rb") as f:
+            return f.read().splitlines()
+
+    def test_layers(self):
+        layers = self.get_layers(self.read_lines())
+        self.assertEqual([layer["z"] for layer in layers], self.LAYER_Z)
+        self.assertTrue(all(layer["runs"] for layer in layers))
+
+    def test_z_hops(self):
+        # lift before and drop back after every travel, with a start gcode move before the first layer
+        lines = []
+        z = None
+        for line in self.read_lines():
+            match = re.match(b"G1 Z(\\d+\\.\\d+) F", line)
+            if match:
+                z = float(match.group(1))
+            if z is None and line == b"M108 S40.0":
+                lines.append(b"G1 X10.000 Y10.000 F7800.000")
+            if line.endswith(b"; move to first point") and z is not None:
+                lines += [b"G1 Z%.3f F7800.000" % (z + 0.4), line, b"G1 Z%.3f F7800.000" % z]
+            else:
+                lines.append(line)
+        plain_layers = self.get_layers(self.read_lines())
+        layers = self.get_layers(lines)
+        self.assertEqual([layer["z"] for layer in layers], self.LAYER_Z)
+        self.assertEqual([layer["runs"] for layer in layers], [layer["runs"] for layer in plain_layers])
+        self.assertGreater(layers[0]["travel_mm"], plain_layers[0]["travel_mm"])
+
+
+if __name__ == "__main__":
+    unittest.main()